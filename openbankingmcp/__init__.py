@@ -14,7 +14,7 @@ from .validate import validate_tools, validate_tool_output
 from .schemas import (
     ACCOUNT_SCHEMA, TRANSACTION_SCHEMA, EXPORT_SCHEMA,
     LIST_ACCOUNTS_OUTPUT_SCHEMA, LIST_TRANSACTIONS_OUTPUT_SCHEMA, EXPORT_HMRC_CSV_OUTPUT_SCHEMA,
-    validate_account, validate_transaction, validate_export
+    validate_account, validate_accounts, validate_transaction, validate_transactions, validate_export
 )
 from .hmrc import normalize_category, CATEGORY_MAP, get_valid_hmrc_categories
 
@@ -32,7 +32,9 @@ __all__ = [
     "LIST_TRANSACTIONS_OUTPUT_SCHEMA",
     "EXPORT_HMRC_CSV_OUTPUT_SCHEMA",
     "validate_account",
+    "validate_accounts",
     "validate_transaction",
+    "validate_transactions",
     "validate_export",
     "normalize_category",
     "CATEGORY_MAP",
@@ -4,9 +4,18 @@ JSON Schema definitions for Open Banking MCP tools.
 Defines schemas for Account, Transaction, and Export data structures.
 """
 
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 from datetime import datetime
 
+# Optional pydantic v2 for validating whole lists in one core call
+try:
+    from typing import Literal, Union
+    from typing_extensions import Annotated, NotRequired, TypedDict
+    from pydantic import AfterValidator, StrictFloat, StrictInt, StrictStr, TypeAdapter, ValidationError
+    PYDANTIC_AVAILABLE = True
+except ImportError:
+    PYDANTIC_AVAILABLE = False
+
 
 # JSON Schema definitions
 ACCOUNT_SCHEMA = {
@@ -110,6 +119,51 @@ EXPORT_HMRC_CSV_OUTPUT_SCHEMA = {
 }
 
 
+def _check_iso_date(value: str) -> str:
+    datetime.strptime(value, "%Y-%m-%d")
+    return value
+
+
+if PYDANTIC_AVAILABLE:
+    # Fast-path checks that are never looser than validate_account /
+    # validate_transaction; a list that fails them is re-checked row by row
+    # so callers get the same errors (and warnings) as before.
+    _Number = Union[StrictInt, StrictFloat]
+
+    class _AccountDict(TypedDict):
+        id: Any
+        name: Any
+        type: Any
+        currency: Literal["GBP", "USD", "EUR"]
+        balance: _Number
+
+    class _TransactionDict(TypedDict):
+        id: Any
+        date: Annotated[StrictStr, AfterValidator(_check_iso_date)]
+        description: Any
+        amount: _Number
+        direction: Literal["credit", "debit"]
+        account_id: Any
+        category: NotRequired[Any]
+
+    _ACCOUNT_LIST_ADAPTER = TypeAdapter(List[_AccountDict])
+    _TRANSACTION_LIST_ADAPTER = TypeAdapter(List[_TransactionDict])
+else:
+    _ACCOUNT_LIST_ADAPTER = None
+    _TRANSACTION_LIST_ADAPTER = None
+
+
+def _bulk_valid(adapter, items: List[Dict[str, Any]]) -> bool:
+    """Return True if pydantic accepts the whole list in a single call."""
+    if adapter is None:
+        return False
+    try:
+        adapter.validate_python(items)
+        return True
+    except ValidationError:
+        return False
+
+
 def validate_account(account: Dict[str, Any]) -> Dict[str, Any]:
     """Validate and normalize an account object."""
     # Basic validation - in a real implementation, you'd use jsonschema library
@@ -149,6 +203,34 @@ def validate_transaction(transaction: Dict[str, Any]) -> Dict[str, Any]:
     return transaction
 
 
+def validate_accounts(accounts: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Validate and normalize a list of account objects in one call."""
+    if _bulk_valid(_ACCOUNT_LIST_ADAPTER, accounts):
+        return accounts
+
+    for i, account in enumerate(accounts):
+        try:
+            validate_account(account)
+        except ValueError as e:
+            raise ValueError(f"accounts[{i}]: {e}")
+
+    return accounts
+
+
+def validate_transactions(transactions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Validate and normalize a list of transaction objects in one call."""
+    if _bulk_valid(_TRANSACTION_LIST_ADAPTER, transactions):
+        return transactions
+
+    for i, transaction in enumerate(transactions):
+        try:
+            validate_transaction(transaction)
+        except ValueError as e:
+            raise ValueError(f"transactions[{i}]: {e}")
+
+    return transactions
+
+
 def validate_export(export: Dict[str, Any]) -> Dict[str, Any]:
     """Validate and normalize an export object."""
     required_fields = ["csv_path", "metadata"]
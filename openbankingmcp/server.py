@@ -14,30 +14,86 @@ import os
 import sys
 import re
 import copy
+import io
+import asyncio
+import httpx
 import requests
 import csv
-from datetime import datetime
-from typing import Any, Dict, List, Optional
+import heapq
+import itertools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from datetime import date, datetime
+from functools import lru_cache, partial
+from operator import itemgetter
+from typing import Any, Dict, List, Optional, Tuple
 from urllib.parse import urlencode
 from .validate import validate_tools, validate_tool_output
 from .pkce import pkce_manager, consent_ledger, generate_random_state
 from .schemas import (
     ACCOUNT_SCHEMA, TRANSACTION_SCHEMA, EXPORT_SCHEMA,
     LIST_ACCOUNTS_OUTPUT_SCHEMA, LIST_TRANSACTIONS_OUTPUT_SCHEMA, EXPORT_HMRC_CSV_OUTPUT_SCHEMA,
-    validate_account, validate_transaction, validate_export
+    validate_accounts, validate_transaction, validate_transactions, validate_export
 )
 from .hmrc import normalize_category
 
+# Optional Aho-Corasick matcher for keyword categorization
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+# Optional pandas for vectorized exports of large transaction sets
+try:
+    import pandas as pd
+    PANDAS_AVAILABLE = True
+except ImportError:
+    PANDAS_AVAILABLE = False
+
+# Optional orjson for faster request parsing and API response encoding
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 # FastAPI imports
 try:
     from fastapi import FastAPI, HTTPException, Query
-    from fastapi.responses import FileResponse, JSONResponse
+    from fastapi.responses import FileResponse, JSONResponse, Response
     from fastapi.middleware.cors import CORSMiddleware
     import uvicorn
     FASTAPI_AVAILABLE = True
 except ImportError:
     FASTAPI_AVAILABLE = False
 
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers catch the latter
+_json_loads = orjson.loads if ORJSON_AVAILABLE else json.loads
+
+
+def _json_dumps_bytes(content: Any) -> bytes:
+    """Serialize content to compact UTF-8 JSON bytes, as JSONResponse would."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(content, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+
+if FASTAPI_AVAILABLE and ORJSON_AVAILABLE:
+    class ORJSONResponse(JSONResponse):
+        """JSONResponse rendered with orjson (also encodes numpy scalars from pandas)."""
+        media_type = "application/json"
+
+        def render(self, content: Any) -> bytes:
+            return orjson.dumps(content, option=orjson.OPT_SERIALIZE_NUMPY)
+
+    APIJSONResponse = ORJSONResponse
+elif FASTAPI_AVAILABLE:
+    APIJSONResponse = JSONResponse
+
 
 def _is_debug_payload_logging_enabled() -> bool:
     """Return True if verbose TrueLayer payload logging is enabled."""
@@ -47,6 +103,122 @@ def _is_debug_payload_logging_enabled() -> bool:
 
 DEBUG_TRUELAYER_PAYLOADS = _is_debug_payload_logging_enabled()
 
+# (connect, read) timeout applied to every TrueLayer request
+TRUELAYER_TIMEOUT = (3.05, 10)
+
+# Refresh access tokens this many seconds before TrueLayer expires them
+TOKEN_EXPIRY_MARGIN_SECONDS = 60
+
+# Upper bound on transaction pages requested from TrueLayer at the same time
+TRUELAYER_MAX_CONCURRENT_PAGES = 8
+
+# Hard cap on pages fetched for one export, in case the API never returns a short page
+TRUELAYER_MAX_PAGES = 200
+
+# Retry policy for transient TrueLayer gateway errors, shared by the requests
+# session and the async page fetcher
+TRUELAYER_RETRY_TOTAL = 3
+TRUELAYER_RETRY_BACKOFF = 0.5
+TRUELAYER_RETRY_STATUSES = (502, 503, 504)
+
+# How long fetched TrueLayer responses are reused for the same access token
+ACCOUNTS_CACHE_TTL_SECONDS = 60
+TRANSACTIONS_CACHE_TTL_SECONDS = 15
+
+# Worker threads dispatching stdin MCP requests concurrently
+MCP_MAX_WORKERS = 8
+
+# Tools that change auth state; they wait for in-flight requests and run alone,
+# so a pipelined call after them sees their effect
+_STATEFUL_TOOLS = frozenset(["create_data_auth_link", "exchange_code", "complete_code_exchange"])
+
+# Exports at least this large go through the pandas pipeline when available
+PANDAS_EXPORT_MIN_ROWS = 500
+
+# Characters replaced with "_" in export filenames
+_UNSAFE_FN_RE = re.compile(r'[<>:"/\\|?*]')
+
+# HMRC categorization buckets, highest priority first
+_CATEGORY_KEYWORDS = (
+    ("Income", ("salary", "invoice", "stripe", "income")),
+    ("Bank Interest", ("interest",)),
+    ("Travel", ("uber", "train", "rail", "tfl", "taxi")),
+    ("Office Costs", ("coffee", "cafe", "restaurant")),
+    ("Utilities", ("gas", "electric", "water", "broadband")),
+    ("Bank charges", ("wise", "transferwise", "fee", "charge")),
+)
+
+# keyword -> (priority, category); lower priority wins when several match
+_KEYWORD_CATEGORIES = {
+    keyword: (priority, category)
+    for priority, (category, keywords) in enumerate(_CATEGORY_KEYWORDS)
+    for keyword in keywords
+}
+
+
+def _create_http_session() -> requests.Session:
+    """Create a pooled HTTP session shared by all TrueLayer calls.
+
+    Transient gateway errors (502/503/504) are retried inside the adapter
+    with exponential backoff, honouring Retry-After, so callers only see a
+    RequestException (and fall back to mock data) once retries are exhausted.
+    """
+    session = requests.Session()
+    retry = Retry(
+        total=TRUELAYER_RETRY_TOTAL,
+        backoff_factor=TRUELAYER_RETRY_BACKOFF,
+        status_forcelist=TRUELAYER_RETRY_STATUSES,
+        allowed_methods=frozenset(["GET", "POST"]),
+        respect_retry_after_header=True
+    )
+    adapter = HTTPAdapter(pool_connections=10, pool_maxsize=20, max_retries=retry)
+    session.mount("https://", adapter)
+    return session
+
+
+def _retry_delay_seconds(response: httpx.Response, attempt: int) -> float:
+    """Seconds to wait before retrying a gateway error, honouring Retry-After."""
+    try:
+        return max(float(response.headers.get("Retry-After", "")), 0.0)
+    except ValueError:
+        return TRUELAYER_RETRY_BACKOFF * (2 ** attempt)
+
+
+@lru_cache(maxsize=4096)
+def _parse_iso_to_ddmmyyyy(date_str: str) -> str:
+    """Convert YYYY-MM-DD to DD/MM/YYYY, returning unparseable input unchanged."""
+    if not date_str:
+        return ""
+    try:
+        return date.fromisoformat(date_str).strftime("%d/%m/%Y")
+    except ValueError:
+        return date_str
+
+
+@lru_cache(maxsize=4096)
+def _parse_ddmmyyyy_to_iso(date_str: str) -> str:
+    """Convert DD/MM/YYYY (day and month may be unpadded) to YYYY-MM-DD."""
+    try:
+        return datetime.strptime(date_str, "%d/%m/%Y").strftime("%Y-%m-%d")
+    except ValueError:
+        raise ValueError(f"Invalid date format: {date_str}")
+
+
+# Header row of HMRC CSV exports
+_HMRC_FIELDNAMES = ("Date", "Description", "Amount", "Currency", "HMRC Category")
+
+# test.csv columns read for every row, fetched in one C-level call
+_CSV_COLS = itemgetter("Date", "Amount", "Description", "HMRC Category")
+
+
+def _run_coroutine_sync(coro):
+    """Run a coroutine to completion from the synchronous stdio path.
+
+    MCP requests are handled on worker threads that have no event loop of
+    their own. Async callers (the FastAPI handlers) await the coroutine instead.
+    """
+    return asyncio.run(coro)
+
 
 def build_tools_list():
     """Describe available MCP tools with JSON schema metadata."""
@@ -389,13 +561,135 @@ def build_tools_list():
     ]
 
 
+# Dummy accounts returned by list_accounts, matching the Account schema
+_DUMMY_ACCOUNTS = [
+    {
+        "id": "acc001",
+        "name": "Primary Current Account",
+        "type": "checking",
+        "currency": "GBP",
+        "balance": 2847.32
+    },
+    {
+        "id": "acc002",
+        "name": "Business Savings",
+        "type": "savings",
+        "currency": "GBP",
+        "balance": 15750.00
+    }
+]
+
+# The dummy accounts never change, so validate them once at import
+_DUMMY_ACCOUNTS_VALIDATED = validate_accounts(_DUMMY_ACCOUNTS)
+
+# Fallback transactions served when TrueLayer is unavailable; account_id is
+# filled in per request
+_MOCK_TRANSACTIONS = [
+    {
+        "id": "txn001",
+        "account_id": "",
+        "amount": -45.50,
+        "currency": "GBP",
+        "description": "TESCO STORES 1234 LONDON",
+        "transaction_type": "debit",
+        "merchant_name": "Tesco",
+        "category": "groceries",
+        "date": "2024-09-15",
+        "timestamp": "2024-09-15T14:30:00Z",
+    },
+    {
+        "id": "txn002",
+        "account_id": "",
+        "amount": -12.99,
+        "currency": "GBP",
+        "description": "AMAZON UK SERVICES",
+        "transaction_type": "debit",
+        "merchant_name": "Amazon",
+        "category": "shopping",
+        "date": "2024-09-14",
+        "timestamp": "2024-09-14T09:15:00Z",
+    },
+    {
+        "id": "txn003",
+        "account_id": "",
+        "amount": 2500.00,
+        "currency": "GBP",
+        "description": "SALARY PAYMENT",
+        "transaction_type": "credit",
+        "merchant_name": "Employer Ltd",
+        "category": "salary",
+        "date": "2024-09-01",
+        "timestamp": "2024-09-01T00:00:00Z",
+    },
+    {
+        "id": "txn004",
+        "account_id": "",
+        "amount": -89.99,
+        "currency": "GBP",
+        "description": "BRITISH GAS ENERGY",
+        "transaction_type": "debit",
+        "merchant_name": "British Gas",
+        "category": "utilities",
+        "date": "2024-08-28",
+        "timestamp": "2024-08-28T06:00:00Z",
+    },
+    {
+        "id": "txn005",
+        "account_id": "",
+        "amount": -25.00,
+        "currency": "GBP",
+        "description": "CASH WITHDRAWAL ATM",
+        "transaction_type": "debit",
+        "merchant_name": "ATM",
+        "category": "cash",
+        "date": "2024-08-25",
+        "timestamp": "2024-08-25T16:45:00Z",
+    }
+]
+
+
 class MCPServer:
     """Implements the Model Context Protocol (MCP) for Cursor integration."""
 
+    # Fields (and defaults) kept when redacting transactions
+    _REDACT_FIELDS = (
+        ("id", ""),
+        ("date", ""),
+        ("amount", 0),
+        ("currency", ""),
+        ("category", ""),
+        ("classification", ""),
+    )
+
     def __init__(self):
         self.tools = validate_tools(build_tools_list())
         # In-memory token storage (in production, use proper storage)
         self.user_tokens = {}
+        # Shared session so TrueLayer keep-alive connections are reused
+        self.http = _create_http_session()
+        # Serializes token refreshes across concurrent API handlers
+        self._token_lock = threading.Lock()
+        # Keeps each JSON-RPC response on its own stdout line when requests
+        # are handled on worker threads
+        self._stdout_lock = threading.Lock()
+        # Keyword matcher, built on first use (overlapped with the fetch in exports)
+        self._cat_automaton = None
+        self._cat_automaton_lock = threading.Lock()
+        # Guards the response and CSV caches below, which worker threads share
+        self._cache_lock = threading.Lock()
+        # Raw CSV bytes and data-row counts keyed by (path, mtime_ns, size)
+        self._csv_cache = {}
+        self._csv_row_counts = {}
+        # Short-lived TrueLayer response caches: (expiry_monotonic, token, results)
+        # for accounts, and (token, account_id, start, end, page, limit) ->
+        # (expiry_monotonic, results) for transaction pages
+        self._accounts_cache = None
+        self._transactions_cache = {}
+        # Mock transactions normalized to the Transaction schema once, with
+        # account_id filled in per request
+        self._mock_schema_transactions = validate_transactions([
+            self._normalize_mock_transaction_to_schema(txn) for txn in _MOCK_TRANSACTIONS
+        ])
 
         # Log startup info
         print(f"🚀 server_start python={sys.version.split()[0]} cwd={os.getcwd()}", file=sys.stderr)
@@ -404,7 +698,9 @@ class MCPServer:
         """Send a JSON response to stdout."""
         # Log outgoing response (redacted)
         self._log_request("rpc_out", response)
-        print(json.dumps(response), flush=True)
+        line = json.dumps(response)
+        with self._stdout_lock:
+            print(line, flush=True)
 
     def send_error(self, request_id: Any, code: int, message: str):
         """Send a JSON-RPC error response."""
@@ -658,7 +954,8 @@ class MCPServer:
                     self.send_error(request.get("id"), -32602, "Invalid date format. Use YYYY-MM-DD")
                     return
 
-                result = self._export_hmrc_csv(account_id, start_date, end_date, filename)
+                # The stdio client is local, so it may write into a directory of its choosing
+                result = self._export_hmrc_csv(account_id, start_date, end_date, filename, allow_directory=True)
                 validated_result = validate_tool_output("export_hmrc_csv", result)
                 self.send_response({
                     "jsonrpc": "2.0",
@@ -763,10 +1060,11 @@ class MCPServer:
             if code_verifier:
                 data["code_verifier"] = code_verifier
 
-            response = requests.post(
+            response = self.http.post(
                 "https://auth.truelayer-sandbox.com/connect/token",
                 data=data,
-                headers={"Content-Type": "application/x-www-form-urlencoded"}
+                headers={"Content-Type": "application/x-www-form-urlencoded"},
+                timeout=TRUELAYER_TIMEOUT
             )
             response.raise_for_status()
 
@@ -775,11 +1073,7 @@ class MCPServer:
             refresh_token = token_data.get("refresh_token")
 
             if access_token:
-                # Store tokens in memory (in production, use proper storage)
-                self.user_tokens["current"] = {
-                    "access_token": access_token,
-                    "refresh_token": refresh_token
-                }
+                self._store_tokens(token_data)
 
                 return {
                     "success": True,
@@ -802,23 +1096,91 @@ class MCPServer:
                 "error": f"Unexpected error: {str(e)}"
             }
 
+    def _store_tokens(self, token_data: Dict[str, Any]):
+        """Store tokens from a TrueLayer token response along with their expiry."""
+        expires_in = token_data.get("expires_in", 3600)
+        # Store tokens in memory (in production, use proper storage)
+        self.user_tokens["current"] = {
+            "access_token": token_data.get("access_token"),
+            "refresh_token": token_data.get("refresh_token"),
+            "expires_at": time.monotonic() + expires_in - TOKEN_EXPIRY_MARGIN_SECONDS
+        }
+
+    def _refresh_user_token(self, refresh_token: str) -> Optional[str]:
+        """Exchange a refresh token for a new access token."""
+        client_id = os.getenv("TRUELAYER_CLIENT_ID")
+        client_secret = os.getenv("TRUELAYER_CLIENT_SECRET")
+
+        if not all([client_id, client_secret]):
+            return None
+
+        try:
+            response = self.http.post(
+                "https://auth.truelayer-sandbox.com/connect/token",
+                data={
+                    "grant_type": "refresh_token",
+                    "client_id": client_id,
+                    "client_secret": client_secret,
+                    "refresh_token": refresh_token
+                },
+                headers={"Content-Type": "application/x-www-form-urlencoded"},
+                timeout=TRUELAYER_TIMEOUT
+            )
+            response.raise_for_status()
+            token_data = response.json()
+        except (requests.exceptions.RequestException, ValueError) as e:
+            print(f"❌ Token refresh failed: {e}", file=sys.stderr)
+            return None
+
+        if not token_data.get("access_token"):
+            print("❌ Token refresh returned no access token", file=sys.stderr)
+            return None
+
+        # TrueLayer may rotate the refresh token; keep the old one otherwise
+        token_data.setdefault("refresh_token", refresh_token)
+        self._store_tokens(token_data)
+        print("🔄 Access token refreshed", file=sys.stderr)
+        return token_data["access_token"]
+
     def _get_user_token(self) -> Optional[str]:
-        """Get the current user's access token."""
+        """Get the current user's access token, refreshing it if it has expired."""
         user_token = self.user_tokens.get("current")
-        if user_token and user_token.get("access_token"):
+        if not user_token or not user_token.get("access_token"):
+            return None
+
+        if time.monotonic() < user_token.get("expires_at", float("inf")):
             return user_token["access_token"]
-        return None
+
+        with self._token_lock:
+            # Another handler may have refreshed while we waited for the lock
+            user_token = self.user_tokens.get("current", {})
+            if time.monotonic() < user_token.get("expires_at", float("inf")):
+                return user_token["access_token"]
+
+            refresh_token = user_token.get("refresh_token")
+            if not refresh_token:
+                print("⚠️ Access token expired and no refresh token available", file=sys.stderr)
+                return None
+
+            return self._refresh_user_token(refresh_token)
 
     def _get_truelayer_token(self):
         """Get TrueLayer token (legacy method for backward compatibility)."""
         return self._get_user_token()
 
     def _fetch_truelayer_accounts(self, token):
-        """Fetch accounts from TrueLayer API."""
+        """Fetch accounts from TrueLayer API, reusing results for ACCOUNTS_CACHE_TTL_SECONDS."""
+        with self._cache_lock:
+            cached = self._accounts_cache
+        if cached and time.monotonic() < cached[0] and cached[1] == token:
+            print(f"📦 Using cached accounts ({len(cached[2])})", file=sys.stderr)
+            return list(cached[2])
+
         try:
-            response = requests.get(
+            response = self.http.get(
                 "https://api.truelayer-sandbox.com/data/v1/accounts",
-                headers={"Authorization": f"Bearer {token}"}
+                headers={"Authorization": f"Bearer {token}"},
+                timeout=TRUELAYER_TIMEOUT
             )
             response.raise_for_status()
 
@@ -828,14 +1190,25 @@ class MCPServer:
             data = response.json()
             results = data.get("results", [])
             print(f"📊 Parsed {len(results)} accounts from TrueLayer response", file=sys.stderr)
-            return results
+            with self._cache_lock:
+                self._accounts_cache = (time.monotonic() + ACCOUNTS_CACHE_TTL_SECONDS, token, results)
+            return list(results)
 
         except requests.exceptions.RequestException as e:
             print(f"❌ TrueLayer accounts API error: {e}")
             raise
 
     def _fetch_truelayer_transactions(self, token, account_id, start_date, end_date, limit=50, page=1):
-        """Fetch transactions from TrueLayer API for a specific account and date range."""
+        """Fetch transactions from TrueLayer API for a specific account and date range.
+
+        Pages are reused for TRANSACTIONS_CACHE_TTL_SECONDS so retries and
+        repeated API calls don't hit TrueLayer again.
+        """
+        cache_key = (token, account_id, start_date, end_date, page, limit)
+        cached = self._get_cached_transactions_page(cache_key)
+        if cached is not None:
+            return cached
+
         try:
             params = {
                 "from": start_date,
@@ -844,10 +1217,11 @@ class MCPServer:
                 "page": page
             }
 
-            response = requests.get(
+            response = self.http.get(
                 f"https://api.truelayer-sandbox.com/data/v1/accounts/{account_id}/transactions",
                 headers={"Authorization": f"Bearer {token}"},
-                params=params
+                params=params,
+                timeout=TRUELAYER_TIMEOUT
             )
             response.raise_for_status()
 
@@ -857,23 +1231,118 @@ class MCPServer:
             data = response.json()
             results = data.get("results", [])
             print(f"📊 Parsed {len(results)} transactions from TrueLayer response", file=sys.stderr)
-            return results
+            self._cache_transactions_page(cache_key, results)
+            return list(results)
 
         except requests.exceptions.RequestException as e:
             print(f"❌ TrueLayer transactions API error: {e}")
             raise
 
-    def _redact_transaction(self, transaction: Dict[str, Any]) -> Dict[str, Any]:
-        """Redact sensitive transaction data for security."""
-        redacted = {
-            "id": transaction.get("id", ""),
-            "date": transaction.get("date", ""),
-            "amount": transaction.get("amount", 0),
-            "currency": transaction.get("currency", ""),
-            "category": transaction.get("category", ""),
-            "classification": transaction.get("classification", "")
-        }
-        return redacted
+    def _get_cached_transactions_page(self, cache_key: tuple) -> Optional[List[Dict[str, Any]]]:
+        """Return a copy of a cached transactions page, or None if it is missing or expired."""
+        with self._cache_lock:
+            cached = self._transactions_cache.get(cache_key)
+        if cached and time.monotonic() < cached[0]:
+            print(f"📦 Using cached transactions page {cache_key[4]} ({len(cached[1])})", file=sys.stderr)
+            return list(cached[1])
+        return None
+
+    def _cache_transactions_page(self, cache_key: tuple, results: List[Dict[str, Any]]):
+        """Store a transactions page for TRANSACTIONS_CACHE_TTL_SECONDS."""
+        now = time.monotonic()
+        with self._cache_lock:
+            # Drop expired pages so the cache doesn't grow with every date range
+            self._transactions_cache = {
+                key: entry for key, entry in self._transactions_cache.items() if now < entry[0]
+            }
+            self._transactions_cache[cache_key] = (now + TRANSACTIONS_CACHE_TTL_SECONDS, results)
+
+    async def _afetch_truelayer_transactions_all_pages(self, token, account_id, start_date, end_date, limit=50):
+        """Fetch every transactions page for an account, requesting pages concurrently.
+
+        Pages are requested in batches of TRUELAYER_MAX_CONCURRENT_PAGES until
+        one comes back short or empty, a page past the first returns 404, or a
+        page starts with a transaction already seen (the API ignored ``page``
+        and sent the same results again). At most TRUELAYER_MAX_PAGES pages are
+        requested. Pages share the cache and gateway retry policy used by
+        _fetch_truelayer_transactions.
+        """
+        url = f"https://api.truelayer-sandbox.com/data/v1/accounts/{account_id}/transactions"
+        connect_timeout, read_timeout = TRUELAYER_TIMEOUT
+
+        async with httpx.AsyncClient(
+            headers={"Authorization": f"Bearer {token}"},
+            # Connection failures are retried by the transport, gateway errors below
+            transport=httpx.AsyncHTTPTransport(
+                retries=TRUELAYER_RETRY_TOTAL,
+                limits=httpx.Limits(max_connections=20, max_keepalive_connections=20)
+            ),
+            timeout=httpx.Timeout(read_timeout, connect=connect_timeout)
+        ) as client:
+
+            async def fetch_page(page):
+                cache_key = (token, account_id, start_date, end_date, page, limit)
+                cached = self._get_cached_transactions_page(cache_key)
+                if cached is not None:
+                    return cached
+
+                params = {"from": start_date, "to": end_date, "limit": limit, "page": page}
+                for attempt in range(TRUELAYER_RETRY_TOTAL + 1):
+                    response = await client.get(url, params=params)
+                    if response.status_code not in TRUELAYER_RETRY_STATUSES or attempt == TRUELAYER_RETRY_TOTAL:
+                        break
+                    await asyncio.sleep(_retry_delay_seconds(response, attempt))
+
+                if response.status_code == 404 and page > 1:
+                    # A speculative page past the end of the data
+                    return []
+                response.raise_for_status()
+                results = response.json().get("results", [])
+                self._cache_transactions_page(cache_key, results)
+                return results
+
+            # Page 1 tells us whether there is anything beyond it; after that,
+            # request pages in concurrent batches until the data runs out.
+            transactions = await fetch_page(1)
+            seen_ids = {txn.get("transaction_id") for txn in transactions} - {None}
+            more = len(transactions) >= limit
+            next_page = 2
+            while more:
+                if next_page > TRUELAYER_MAX_PAGES:
+                    print(f"⚠️ Stopped after {TRUELAYER_MAX_PAGES} transaction pages", file=sys.stderr)
+                    break
+
+                pages = range(next_page, min(next_page + TRUELAYER_MAX_CONCURRENT_PAGES, TRUELAYER_MAX_PAGES + 1))
+                batch = await asyncio.gather(*(fetch_page(p) for p in pages))
+                next_page = pages.stop
+                for page_results in batch:
+                    first_id = page_results[0].get("transaction_id") if page_results else None
+                    if not page_results or (first_id is not None and first_id in seen_ids):
+                        more = False
+                        break
+                    transactions.extend(page_results)
+                    seen_ids.update(txn.get("transaction_id") for txn in page_results)
+                    if len(page_results) < limit:
+                        more = False
+                        break
+
+        print(f"📊 Parsed {len(transactions)} transactions from all TrueLayer pages", file=sys.stderr)
+        return transactions
+
+    def _fetch_truelayer_transactions_all_pages(self, token, account_id, start_date, end_date, limit=50):
+        """Fetch every transactions page for an account and date range."""
+        try:
+            return _run_coroutine_sync(
+                self._afetch_truelayer_transactions_all_pages(token, account_id, start_date, end_date, limit)
+            )
+        except httpx.HTTPError as e:
+            print(f"❌ TrueLayer transactions API error: {e}", file=sys.stderr)
+            raise
+
+    def _redact_transactions(self, transactions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Redact sensitive transaction data for security, keeping only _REDACT_FIELDS."""
+        fields = self._REDACT_FIELDS
+        return [{key: txn.get(key, default) for key, default in fields} for txn in transactions]
 
     def _get_accounts_data(self):
         """Get accounts data, trying TrueLayer first, then falling back to mock data."""
@@ -910,50 +1379,54 @@ class MCPServer:
 
     def _list_accounts(self):
         """Return 1-2 dummy accounts with proper schema validation."""
-        # Create dummy accounts that match the Account schema
-        dummy_accounts = [
-            {
-                "id": "acc001",
-                "name": "Primary Current Account",
-                "type": "checking",
-                "currency": "GBP",
-                "balance": 2847.32
-            },
-            {
-                "id": "acc002",
-                "name": "Business Savings",
-                "type": "savings",
-                "currency": "GBP",
-                "balance": 15750.00
-            }
-        ]
+        # Validated once at import; copy each account so callers can't alter the cache
+        return {
+            "accounts": [dict(account) for account in _DUMMY_ACCOUNTS_VALIDATED]
+        }
 
-        # Validate each account
-        validated_accounts = []
-        for account in dummy_accounts:
+    def _get_transactions_data(self, account_id, start_date, end_date, limit=50, page=1, include_raw=False, all_pages=False):
+        """Get transactions data, trying TrueLayer first, then falling back to mock data.
+
+        With ``all_pages`` set, every page of the date range is fetched
+        (concurrently) and ``page`` is ignored.
+        """
+        token = self._get_truelayer_token()
+        if token:
             try:
-                validated_account = validate_account(account)
-                validated_accounts.append(validated_account)
-            except ValueError as e:
-                print(f"❌ Account validation error: {e}", file=sys.stderr)
-                continue
+                print(f"🔑 User token found, fetching transactions for {account_id} ({start_date} to {end_date})...", file=sys.stderr)
+                if all_pages:
+                    transactions = self._fetch_truelayer_transactions_all_pages(token, account_id, start_date, end_date, limit)
+                else:
+                    transactions = self._fetch_truelayer_transactions(token, account_id, start_date, end_date, limit, page)
+                print(f"✅ TrueLayer returned {len(transactions)} transactions", file=sys.stderr)
 
-        return {
-            "accounts": validated_accounts
-        }
+                if not include_raw:
+                    # Redact sensitive data by default
+                    transactions = self._redact_transactions(transactions)
 
-    def _get_transactions_data(self, account_id, start_date, end_date, limit=50, page=1, include_raw=False):
-        """Get transactions data, trying TrueLayer first, then falling back to mock data."""
+                return transactions
+            except Exception as e:
+                print(f"❌ TrueLayer transactions API error: {e}", file=sys.stderr)
+                print("🔄 Falling back to mock data...", file=sys.stderr)
+        else:
+            print("⚠️ No user token found, using mock data", file=sys.stderr)
+
+        return self._mock_transactions_data(account_id, include_raw)
+
+    async def _aget_transactions_data(self, account_id, start_date, end_date, limit=50, include_raw=False):
+        """Awaitable _get_transactions_data(all_pages=True) for the async API handlers."""
         token = self._get_truelayer_token()
         if token:
             try:
                 print(f"🔑 User token found, fetching transactions for {account_id} ({start_date} to {end_date})...", file=sys.stderr)
-                transactions = self._fetch_truelayer_transactions(token, account_id, start_date, end_date, limit, page)
+                transactions = await self._afetch_truelayer_transactions_all_pages(
+                    token, account_id, start_date, end_date, limit
+                )
                 print(f"✅ TrueLayer returned {len(transactions)} transactions", file=sys.stderr)
 
                 if not include_raw:
                     # Redact sensitive data by default
-                    transactions = [self._redact_transaction(txn) for txn in transactions]
+                    transactions = self._redact_transactions(transactions)
 
                 return transactions
             except Exception as e:
@@ -962,73 +1435,15 @@ class MCPServer:
         else:
             print("⚠️ No user token found, using mock data", file=sys.stderr)
 
-        # Fallback mock data
-        mock_transactions = [
-            {
-                "id": "txn001",
-                "account_id": account_id,
-                "amount": -45.50,
-                "currency": "GBP",
-                "description": "TESCO STORES 1234 LONDON",
-                "transaction_type": "debit",
-                "merchant_name": "Tesco",
-                "category": "groceries",
-                "date": "2024-09-15",
-                "timestamp": "2024-09-15T14:30:00Z",
-            },
-            {
-                "id": "txn002",
-                "account_id": account_id,
-                "amount": -12.99,
-                "currency": "GBP",
-                "description": "AMAZON UK SERVICES",
-                "transaction_type": "debit",
-                "merchant_name": "Amazon",
-                "category": "shopping",
-                "date": "2024-09-14",
-                "timestamp": "2024-09-14T09:15:00Z",
-            },
-            {
-                "id": "txn003",
-                "account_id": account_id,
-                "amount": 2500.00,
-                "currency": "GBP",
-                "description": "SALARY PAYMENT",
-                "transaction_type": "credit",
-                "merchant_name": "Employer Ltd",
-                "category": "salary",
-                "date": "2024-09-01",
-                "timestamp": "2024-09-01T00:00:00Z",
-            },
-            {
-                "id": "txn004",
-                "account_id": account_id,
-                "amount": -89.99,
-                "currency": "GBP",
-                "description": "BRITISH GAS ENERGY",
-                "transaction_type": "debit",
-                "merchant_name": "British Gas",
-                "category": "utilities",
-                "date": "2024-08-28",
-                "timestamp": "2024-08-28T06:00:00Z",
-            },
-            {
-                "id": "txn005",
-                "account_id": account_id,
-                "amount": -25.00,
-                "currency": "GBP",
-                "description": "CASH WITHDRAWAL ATM",
-                "transaction_type": "debit",
-                "merchant_name": "ATM",
-                "category": "cash",
-                "date": "2024-08-25",
-                "timestamp": "2024-08-25T16:45:00Z",
-            }
-        ]
+        return self._mock_transactions_data(account_id, include_raw)
+
+    def _mock_transactions_data(self, account_id, include_raw=False):
+        """Mock transactions for account_id, used when TrueLayer is unavailable."""
+        mock_transactions = [{**txn, "account_id": account_id} for txn in _MOCK_TRANSACTIONS]
 
         if not include_raw:
             # Redact sensitive data by default
-            mock_transactions = [self._redact_transaction(txn) for txn in mock_transactions]
+            mock_transactions = self._redact_transactions(mock_transactions)
 
         return mock_transactions
 
@@ -1043,70 +1458,183 @@ class MCPServer:
         offset = int(args.get("offset", 0))
 
         transactions = []
+        total = None
 
         # Try to read from test.csv file
         csv_file = "test.csv"
         if os.path.exists(csv_file):
             try:
-                with open(csv_file, 'r', encoding='utf-8') as f:
-                    reader = csv.DictReader(f)
-                    for row_num, row in enumerate(reader, 1):
-                        try:
-                            # Normalize CSV row to Transaction schema
-                            transaction = self._normalize_csv_row_to_transaction(row, account_id, row_num)
-                            validated_transaction = validate_transaction(transaction)
-                            transactions.append(validated_transaction)
-                        except ValueError as e:
-                            print(f"❌ Transaction validation error on row {row_num}: {e}", file=sys.stderr)
-                            continue
-
-                print(f"✅ Loaded {len(transactions)} transactions from {csv_file}", file=sys.stderr)
+                # File contents are cached until it changes; only the
+                # requested page is normalized and validated
+                key, data = self._read_csv_bytes(csv_file)
+                if PANDAS_AVAILABLE:
+                    transactions = self._load_csv_transactions_frame(data, account_id, offset, limit)
+                else:
+                    transactions = self._load_csv_transactions(data, account_id, offset, limit)
+                total = self._count_csv_rows(key, data)
+
+                print(f"✅ Loaded {len(transactions)} of {total} transactions from {csv_file}", file=sys.stderr)
             except Exception as e:
                 print(f"❌ Error reading CSV file: {e}", file=sys.stderr)
         else:
             print(f"⚠️ CSV file {csv_file} not found, using mock transactions", file=sys.stderr)
-            # Fallback to mock data
-            mock_transactions = self._get_transactions_data(account_id, start_date, end_date, include_raw=True)
-            for txn in mock_transactions:
-                try:
-                    # Normalize mock transaction to schema
-                    normalized_txn = self._normalize_mock_transaction_to_schema(txn)
-                    validated_transaction = validate_transaction(normalized_txn)
-                    transactions.append(validated_transaction)
-                except ValueError as e:
-                    print(f"❌ Mock transaction validation error: {e}", file=sys.stderr)
-                    continue
+            if self._get_truelayer_token():
+                # Live data has to be normalized on every call
+                live_transactions = self._get_transactions_data(account_id, start_date, end_date, include_raw=True)
+                # Normalize TrueLayer transactions to schema
+                normalized = [self._normalize_mock_transaction_to_schema(txn) for txn in live_transactions]
+                transactions = self._validate_transactions_or_drop(normalized, "Mock transaction validation error")
+            else:
+                # Fallback to mock data, already normalized and validated
+                transactions = [{**txn, "account_id": account_id} for txn in self._mock_schema_transactions]
 
-        # Apply offset and limit to transactions
-        paginated_transactions = transactions[offset:offset + limit]
+            # Apply offset and limit to transactions
+            total = len(transactions)
+            transactions = transactions[offset:offset + limit]
+
+        if total is None:
+            total = len(transactions)
 
         return {
-            "transactions": paginated_transactions,
+            "transactions": transactions,
             "pagination": {
-                "total": len(transactions),
+                "total": total,
                 "page": (offset // limit) + 1,
                 "limit": limit,
                 "offset": offset,
-                "has_more": offset + limit < len(transactions)
+                "has_more": offset + limit < total
             }
         }
 
+    def _read_csv_bytes(self, csv_file: str) -> Tuple[Tuple[str, int, int], bytes]:
+        """Return (cache key, raw bytes) for a CSV file, re-reading it only when it changes."""
+        st = os.stat(csv_file)
+        key = (csv_file, st.st_mtime_ns, st.st_size)
+        with self._cache_lock:
+            data = self._csv_cache.get(key)
+        if data is None:
+            with open(csv_file, 'rb') as f:
+                # Key the bytes by the file actually read, in case it was replaced since the stat
+                st = os.fstat(f.fileno())
+                key = (csv_file, st.st_mtime_ns, st.st_size)
+                data = f.read()
+            with self._cache_lock:
+                self._csv_cache.clear()
+                self._csv_cache[key] = data
+        return key, data
+
+    def _count_csv_rows(self, key: Tuple[str, int, int], data: bytes) -> int:
+        """Count data rows in cached CSV bytes, memoized per cache key."""
+        with self._cache_lock:
+            row_count = self._csv_row_counts.get(key)
+        if row_count is None:
+            text = io.StringIO(data.decode('utf-8'), newline='')
+            # Blank lines are skipped by DictReader, so don't count them
+            row_count = max(sum(1 for row in csv.reader(text) if row) - 1, 0)
+            with self._cache_lock:
+                self._csv_row_counts.clear()
+                self._csv_row_counts[key] = row_count
+        # Return the local count; another thread may clear the dict at any time
+        return row_count
+
+    def _load_csv_transactions(self, data: bytes, account_id: str, offset: int, limit: int) -> List[Dict[str, Any]]:
+        """Read one page of CSV rows into validated transactions."""
+        transactions = []
+        reader = csv.DictReader(io.StringIO(data.decode('utf-8'), newline=''))
+        page_rows = itertools.islice(reader, offset, offset + limit)
+        for row_num, row in enumerate(page_rows, offset + 1):
+            try:
+                # Normalize CSV row to Transaction schema
+                transactions.append(self._normalize_csv_row_to_transaction(row, account_id, row_num))
+            except ValueError as e:
+                print(f"❌ Transaction validation error on row {row_num}: {e}", file=sys.stderr)
+                continue
+
+        return self._validate_transactions_or_drop(transactions, "Transaction validation error")
+
+    def _load_csv_transactions_frame(self, data: bytes, account_id: str, offset: int, limit: int) -> List[Dict[str, Any]]:
+        """Vectorized equivalent of _load_csv_transactions using pandas."""
+        # skiprows/nrows count physical lines, not records, so they would drift
+        # past blank lines and quoted newlines; slice by record instead, as
+        # the csv reader and _count_csv_rows do
+        df = pd.read_csv(
+            io.BytesIO(data),
+            dtype=str,
+            keep_default_na=False,
+            encoding='utf-8',
+            skip_blank_lines=True
+        ).iloc[offset:offset + limit].reset_index(drop=True)
+
+        def column(name, default=""):
+            if name in df.columns:
+                return df[name]
+            return pd.Series(default, index=df.index, dtype=object)
+
+        # Convert date from DD/MM/YYYY to YYYY-MM-DD; other values pass through
+        dates = column("Date")
+        has_slash = dates.str.contains("/", regex=False)
+        parsed_dates = pd.to_datetime(dates.where(has_slash), format="%d/%m/%Y", errors="coerce")
+        normalized_dates = parsed_dates.dt.strftime("%Y-%m-%d").where(has_slash, dates)
+
+        amount_strs = column("Amount", "0")
+        amounts = pd.to_numeric(amount_strs, errors="coerce")
+
+        frame = pd.DataFrame({
+            "id": [f"txn_{row_num:03d}" for row_num in range(offset + 1, offset + len(df) + 1)],
+            "date": normalized_dates,
+            "description": column("Description"),
+            "amount": amounts,
+            "direction": amounts.ge(0).map({True: "credit", False: "debit"}),
+            "account_id": account_id,
+            "category": column("HMRC Category")
+        })
+
+        # Report and drop rows that could not be normalized
+        bad_dates = has_slash & normalized_dates.isna()
+        bad_amounts = amounts.isna()
+        for index in (bad_dates | bad_amounts).to_numpy().nonzero()[0]:
+            if bad_dates.iloc[index]:
+                error = f"Invalid date format: {dates.iloc[index]}"
+            else:
+                error = f"Invalid amount: {amount_strs.iloc[index]}"
+            print(f"❌ Transaction validation error on row {offset + index + 1}: {error}", file=sys.stderr)
+        frame = frame[~(bad_dates | bad_amounts)]
+
+        records = frame.to_dict(orient="records")
+        return self._validate_transactions_or_drop(records, "Transaction validation error")
+
+    def _validate_transactions_or_drop(self, transactions: List[Dict[str, Any]], error_label: str) -> List[Dict[str, Any]]:
+        """Validate a list in one call, falling back to dropping (and reporting) invalid rows."""
+        try:
+            return validate_transactions(transactions)
+        except ValueError:
+            # Only pay for per-row handling when something is actually invalid
+            valid = []
+            for transaction in transactions:
+                try:
+                    valid.append(validate_transaction(transaction))
+                except ValueError as e:
+                    print(f"❌ {error_label} on {transaction.get('id')}: {e}", file=sys.stderr)
+            return valid
+
     def _normalize_csv_row_to_transaction(self, row: Dict[str, str], account_id: str, row_num: int) -> Dict[str, Any]:
         """Normalize a CSV row to Transaction schema format."""
+        try:
+            date_str, amount_str, description, category = _CSV_COLS(row)
+        except KeyError:
+            # Header is missing a column; fall back to per-field defaults
+            date_str = row.get("Date", "")
+            amount_str = row.get("Amount", "0")
+            description = row.get("Description", "")
+            category = row.get("HMRC Category", "")
+
         # Convert date from DD/MM/YYYY to YYYY-MM-DD
-        date_str = row.get("Date", "")
         if date_str and "/" in date_str:
-            try:
-                # Parse DD/MM/YYYY format
-                day, month, year = date_str.split("/")
-                normalized_date = f"{year}-{month.zfill(2)}-{day.zfill(2)}"
-            except ValueError:
-                raise ValueError(f"Invalid date format: {date_str}")
+            normalized_date = _parse_ddmmyyyy_to_iso(date_str)
         else:
             normalized_date = date_str
 
         # Parse amount
-        amount_str = row.get("Amount", "0")
         try:
             amount = float(amount_str)
         except ValueError:
@@ -1118,11 +1646,11 @@ class MCPServer:
         return {
             "id": f"txn_{row_num:03d}",
             "date": normalized_date,
-            "description": row.get("Description", ""),
+            "description": description,
             "amount": amount,
             "direction": direction,
             "account_id": account_id,
-            "category": row.get("HMRC Category", "")
+            "category": category
         }
 
     def _normalize_mock_transaction_to_schema(self, txn: Dict[str, Any]) -> Dict[str, Any]:
@@ -1186,6 +1714,45 @@ class MCPServer:
 
         return result
 
+    def _build_category_automaton(self):
+        """Compile all categorization keywords into a single matcher."""
+        if AHOCORASICK_AVAILABLE:
+            automaton = ahocorasick.Automaton()
+            for keyword, value in _KEYWORD_CATEGORIES.items():
+                automaton.add_word(keyword, value)
+            automaton.make_automaton()
+            return automaton
+
+        # Fallback: one regex that reports every keyword start position.
+        # Alternatives are ordered by priority, so at any given position the
+        # highest priority keyword is the one captured.
+        alternatives = "|".join(
+            re.escape(keyword)
+            for _, keywords in _CATEGORY_KEYWORDS
+            for keyword in keywords
+        )
+        return re.compile(f"(?=({alternatives}))")
+
+    def _get_category_automaton(self):
+        """Return the keyword matcher, building it once on first use."""
+        if self._cat_automaton is None:
+            with self._cat_automaton_lock:
+                # Another thread may have built it while we waited
+                if self._cat_automaton is None:
+                    self._cat_automaton = self._build_category_automaton()
+        return self._cat_automaton
+
+    def _match_keyword_category(self, description: str) -> Optional[str]:
+        """Return the highest priority keyword category found in description."""
+        automaton = self._get_category_automaton()
+        if AHOCORASICK_AVAILABLE:
+            hits = (value for _, value in automaton.iter(description))
+        else:
+            hits = (_KEYWORD_CATEGORIES[m.group(1)] for m in automaton.finditer(description))
+
+        best = min(hits, default=None)
+        return best[1] if best else None
+
     def _categorize_transaction(self, transaction: Dict[str, Any]) -> str:
         """Categorize transaction for HMRC reporting."""
         # If transaction already has a category, normalize it
@@ -1198,98 +1765,179 @@ class MCPServer:
                       transaction.get("merchant_name", "")).lower()
 
         # HMRC categorization buckets
-        if any(keyword in description for keyword in ["salary", "invoice", "stripe", "income"]):
-            return normalize_category("Income")
-        elif any(keyword in description for keyword in ["interest"]):
-            return normalize_category("Bank Interest")
-        elif any(keyword in description for keyword in ["uber", "train", "rail", "tfl", "taxi"]):
-            return normalize_category("Travel")
-        elif any(keyword in description for keyword in ["coffee", "cafe", "restaurant"]):
-            return normalize_category("Office Costs")
-        elif any(keyword in description for keyword in ["gas", "electric", "water", "broadband"]):
-            return normalize_category("Utilities")
-        elif any(keyword in description for keyword in ["wise", "transferwise", "fee", "charge"]):
-            return normalize_category("Bank charges")
+        category = self._match_keyword_category(description)
+        return normalize_category(category or "General expenses")
+
+    def _sanitize_filename(self, filename: str, allow_directory: bool = False) -> str:
+        """Sanitize filename to be safe for filesystem.
+
+        With ``allow_directory``, an absolute path into an existing directory
+        is kept and only its final component is sanitized; anything else is
+        flattened into a single file name in the working directory.
+        """
+        directory, name = os.path.split(filename)
+        if allow_directory and os.path.isabs(directory) and os.path.isdir(directory):
+            filename = name
         else:
-            return normalize_category("General expenses")
+            directory = ""
 
-    def _sanitize_filename(self, filename: str) -> str:
-        """Sanitize filename to be safe for filesystem."""
-        # Remove or replace unsafe characters
-        safe_filename = re.sub(r'[<>:"/\\|?*]', '_', filename)
-        # Ensure it has .csv extension
+        # Replace unsafe characters and ensure a .csv extension
+        safe_filename = _UNSAFE_FN_RE.sub('_', filename)
         if not safe_filename.endswith('.csv'):
             safe_filename += '.csv'
-        return safe_filename
+        return os.path.join(directory, safe_filename) if directory else safe_filename
 
-    def _export_hmrc_csv(self, account_id: str, start_date: str, end_date: str, filename: Optional[str] = None) -> Dict[str, Any]:
-        """Export transactions as HMRC-ready CSV with categorization and summary."""
-        # Get transactions data
-        transactions = self._get_transactions_data(account_id, start_date, end_date, include_raw=True)
+    def _write_hmrc_csv_rows(self, transactions: List[Dict[str, Any]], csvfile) -> Tuple[int, float, float, Dict[str, float]]:
+        """Stream HMRC CSV rows to csvfile, accumulating totals in the same pass."""
+        writer = csv.writer(csvfile)
+        writer.writerow(_HMRC_FIELDNAMES)
 
-        # Generate filename if not provided
-        if not filename:
-            filename = f"hmrc_export_{account_id}_{start_date}_{end_date}.csv"
-
-        # Sanitize filename
-        safe_filename = self._sanitize_filename(filename)
-
-        # Prepare CSV data
-        csv_rows = []
+        row_count = 0
         income_total = 0
         expense_total = 0
         category_totals = {}
 
+        # Local aliases keep global/attribute lookups out of the per-row loop
+        writerow = writer.writerow
+        format_date = _parse_iso_to_ddmmyyyy
+        categorize = self._categorize_transaction
+        category_total = category_totals.get
+
         for transaction in transactions:
+            get = transaction.get
+
             # Convert date from YYYY-MM-DD to DD/MM/YYYY
-            date_str = transaction.get("date", "")
-            if date_str:
-                try:
-                    date_obj = datetime.strptime(date_str, "%Y-%m-%d")
-                    formatted_date = date_obj.strftime("%d/%m/%Y")
-                except ValueError:
-                    formatted_date = date_str
-            else:
-                formatted_date = ""
+            formatted_date = format_date(get("date", ""))
 
             # Get amount and currency
-            amount = transaction.get("amount", 0)
-            currency = transaction.get("currency", "GBP")
+            amount = get("amount", 0)
+            abs_amount = abs(amount)  # HMRC wants positive amounts
+            currency = get("currency", "GBP")
 
             # Categorize transaction
-            category = self._categorize_transaction(transaction)
+            category = categorize(transaction)
 
             # Get description
-            description = transaction.get("description", "") or transaction.get("merchant_name", "")
-
-            # Add to CSV
-            csv_rows.append({
-                "Date": formatted_date,
-                "Description": description,
-                "Amount": abs(amount),  # HMRC wants positive amounts
-                "Currency": currency,
-                "HMRC Category": category
-            })
+            description = get("description", "") or get("merchant_name", "")
+
+            writerow((formatted_date, description, f"{abs_amount:.2f}", currency, category))
+            row_count += 1
 
             # Calculate totals
             if amount > 0:
                 income_total += amount
             else:
-                expense_total += abs(amount)
+                expense_total += abs_amount
 
             # Track category totals
-            category_totals[category] = category_totals.get(category, 0) + abs(amount)
+            category_totals[category] = category_total(category, 0) + abs_amount
+
+        return row_count, income_total, expense_total, category_totals
+
+    def _write_hmrc_csv_frame(self, transactions: List[Dict[str, Any]], csvfile) -> Tuple[int, float, float, Dict[str, float]]:
+        """Vectorized equivalent of _write_hmrc_csv_rows for large exports."""
+        df = pd.DataFrame(transactions).reindex(
+            columns=["date", "amount", "currency", "description", "merchant_name", "category"]
+        )
+
+        # Convert date from YYYY-MM-DD to DD/MM/YYYY, keeping unparseable values as-is
+        dates = df["date"].fillna("").astype(str)
+        parsed_dates = pd.to_datetime(dates, format="%Y-%m-%d", errors="coerce")
+        formatted_dates = parsed_dates.dt.strftime("%d/%m/%Y").fillna(dates)
+
+        amounts = pd.to_numeric(df["amount"]).fillna(0)
+
+        abs_amounts = amounts.abs()  # HMRC wants positive amounts
+
+        descriptions = df["description"].fillna("").astype(str)
+        merchant_names = df["merchant_name"].fillna("").astype(str)
+
+        # Same rules as _categorize_transaction, evaluated once per distinct
+        # existing category or search text rather than once per row
+        existing = df["category"].fillna("").astype(str)
+        has_existing = existing != ""
+        search_text = (descriptions + " " + merchant_names).str.lower()
+        match = self._match_keyword_category
+        categories = existing.map({c: normalize_category(c) for c in existing[has_existing].unique()}).where(
+            has_existing,
+            search_text.map({
+                text: normalize_category(match(text) or "General expenses")
+                for text in search_text[~has_existing].unique()
+            })
+        )
+
+        csv_frame = pd.DataFrame({
+            "Date": formatted_dates,
+            "Description": descriptions.where(descriptions != "", merchant_names),
+            "Amount": abs_amounts.map("{:.2f}".format),
+            "Currency": df["currency"].fillna("GBP"),
+            "HMRC Category": categories
+        }, columns=_HMRC_FIELDNAMES)
+        csv_frame.to_csv(csvfile, index=False, lineterminator="\r\n")
+
+        income_total = float(amounts[amounts > 0].sum())
+        expense_total = float(abs_amounts[amounts <= 0].sum())
+        category_totals = {
+            category: float(total)
+            for category, total in abs_amounts.groupby(categories).sum().items()
+        }
+
+        return len(csv_frame), income_total, expense_total, category_totals
+
+    def _export_hmrc_csv(self, account_id: str, start_date: str, end_date: str, filename: Optional[str] = None,
+                         allow_directory: bool = False) -> Dict[str, Any]:
+        """Export transactions as HMRC-ready CSV with categorization and summary."""
+        # Get transactions data. The first export builds the keyword matcher on a
+        # helper thread while the fetch is in flight; later ones skip the thread.
+        if self._cat_automaton is None:
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                automaton_future = executor.submit(self._get_category_automaton)
+                transactions = self._get_transactions_data(
+                    account_id, start_date, end_date, include_raw=True, all_pages=True
+                )
+                automaton_future.result()
+        else:
+            transactions = self._get_transactions_data(account_id, start_date, end_date, include_raw=True, all_pages=True)
+
+        return self._build_hmrc_export(transactions, account_id, start_date, end_date, filename, allow_directory)
+
+    async def _aexport_hmrc_csv(self, account_id: str, start_date: str, end_date: str, filename: Optional[str] = None,
+                                allow_directory: bool = False) -> Dict[str, Any]:
+        """Awaitable _export_hmrc_csv for the async API handlers.
+
+        Pages are fetched on the running event loop. Building the keyword
+        matcher and writing the CSV run on the loop's default executor, so the
+        loop keeps serving other requests meanwhile.
+        """
+        loop = asyncio.get_running_loop()
+        fetch = self._aget_transactions_data(account_id, start_date, end_date, include_raw=True)
+        if self._cat_automaton is None:
+            transactions, _ = await asyncio.gather(fetch, loop.run_in_executor(None, self._get_category_automaton))
+        else:
+            transactions = await fetch
+
+        return await loop.run_in_executor(None, partial(
+            self._build_hmrc_export, transactions, account_id, start_date, end_date, filename, allow_directory
+        ))
+
+    def _build_hmrc_export(self, transactions: List[Dict[str, Any]], account_id: str, start_date: str, end_date: str,
+                           filename: Optional[str], allow_directory: bool) -> Dict[str, Any]:
+        """Write fetched transactions as an HMRC CSV and return the export metadata and summary."""
+        # Generate filename if not provided
+        if not filename:
+            filename = f"hmrc_export_{account_id}_{start_date}_{end_date}.csv"
+
+        # Sanitize filename
+        safe_filename = self._sanitize_filename(filename, allow_directory)
 
-        # Write CSV file
+        # Write CSV file, streaming rows unless the export is large enough for pandas
+        use_pandas = PANDAS_AVAILABLE and len(transactions) >= PANDAS_EXPORT_MIN_ROWS
+        write_rows = self._write_hmrc_csv_frame if use_pandas else self._write_hmrc_csv_rows
         try:
             with open(safe_filename, 'w', newline='', encoding='utf-8') as csvfile:
-                fieldnames = ["Date", "Description", "Amount", "Currency", "HMRC Category"]
-                writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-
-                writer.writeheader()
-                writer.writerows(csv_rows)
+                row_count, income_total, expense_total, category_totals = write_rows(transactions, csvfile)
 
-            print(f"✅ CSV exported to {safe_filename} with {len(csv_rows)} transactions", file=sys.stderr)
+            print(f"✅ CSV exported to {safe_filename} with {row_count} transactions", file=sys.stderr)
         except Exception as e:
             print(f"❌ Error writing CSV file: {e}", file=sys.stderr)
             return {
@@ -1303,7 +1951,7 @@ class MCPServer:
 
         # Get top 3 expense categories
         expense_categories = {k: v for k, v in category_totals.items() if k != "Income" and k != "Bank Interest"}
-        top_expenses = sorted(expense_categories.items(), key=lambda x: x[1], reverse=True)[:3]
+        top_expenses = heapq.nlargest(3, expense_categories.items(), key=itemgetter(1))
 
         # Create export metadata
         export_data = {
@@ -1312,7 +1960,7 @@ class MCPServer:
                 "account_id": account_id,
                 "start_date": start_date,
                 "end_date": end_date,
-                "transaction_count": len(csv_rows),
+                "transaction_count": row_count,
                 "total_income": income_total,
                 "total_expenses": expense_total,
                 "net_total": net_total,
@@ -1337,7 +1985,7 @@ class MCPServer:
 File: {safe_filename}
 Period: {start_date} to {end_date}
 Account: {account_id}
-Transactions: {len(csv_rows)}
+Transactions: {row_count}
 
 Totals:
 - Income: £{income_total:.2f}
@@ -1356,6 +2004,14 @@ Top 3 Expense Categories:
         }
 
 
+def _is_stateful_request(request: Any) -> bool:
+    """Return True for tools/call requests to a tool in _STATEFUL_TOOLS."""
+    if not isinstance(request, dict) or request.get("method") != "tools/call":
+        return False
+    params = request.get("params")
+    return isinstance(params, dict) and params.get("name") in _STATEFUL_TOOLS
+
+
 def run_mcp_server():
     """Run the MCP server using stdio communication."""
     print("🚀 OpenBanking MCP server starting...", file=sys.stderr)
@@ -1363,20 +2019,37 @@ def run_mcp_server():
 
     server = MCPServer()
 
-    # Read from stdin line by line
-    for line in sys.stdin:
-        line = line.strip()
-        if not line:
-            continue
-
+    def dispatch(request):
         try:
-            request = json.loads(line)
             server.handle_request(request)
-        except json.JSONDecodeError as e:
-            server.send_error(None, -32700, f"Parse error: {e}")
         except Exception as e:
             server.send_error(None, -32603, f"Internal error: {e}")
 
+    # Read from stdin line by line; requests are handled on a thread pool so a
+    # slow TrueLayer call doesn't block the next request. Responses may be
+    # written out of order and are matched to requests by id. Auth tools are
+    # a barrier: they run once everything before them has finished, and
+    # nothing after them starts until they have.
+    pending = set()
+    with ThreadPoolExecutor(max_workers=MCP_MAX_WORKERS) as executor:
+        for line in sys.stdin:
+            line = line.strip()
+            if not line:
+                continue
+
+            try:
+                request = _json_loads(line)
+            except json.JSONDecodeError as e:
+                server.send_error(None, -32700, f"Parse error: {e}")
+                continue
+
+            pending = {future for future in pending if not future.done()}
+            if _is_stateful_request(request):
+                wait(pending)
+                dispatch(request)
+            else:
+                pending.add(executor.submit(dispatch, request))
+
 
 def create_fastapi_app():
     """Create FastAPI application with REST API endpoints."""
@@ -1386,7 +2059,8 @@ def create_fastapi_app():
     app = FastAPI(
         title="OpenBanking MCP REST API",
         description="REST API layer for OpenBanking MCP server",
-        version="1.0.0"
+        version="1.0.0",
+        default_response_class=APIJSONResponse
     )
 
     # Add CORS middleware for web client
@@ -1407,7 +2081,7 @@ def create_fastapi_app():
         try:
             result = mcp_server._list_accounts()
             validated_result = validate_tool_output("list_accounts", result)
-            return JSONResponse(content=validated_result)
+            return APIJSONResponse(content=validated_result)
         except Exception as e:
             print(f"❌ API Error in get_accounts: {e}", file=sys.stderr)
             raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
@@ -1434,7 +2108,8 @@ def create_fastapi_app():
                 "offset": 0
             })
             validated_result = validate_tool_output("list_transactions", result)
-            return JSONResponse(content=validated_result)
+            # Serialize the (potentially large) transaction list once, straight to bytes
+            return Response(content=_json_dumps_bytes(validated_result), media_type="application/json")
         except HTTPException:
             raise
         except Exception as e:
@@ -1454,7 +2129,7 @@ def create_fastapi_app():
             if not mcp_server._validate_date_format(start_date) or not mcp_server._validate_date_format(end_date):
                 raise HTTPException(status_code=400, detail="Invalid date format. Use YYYY-MM-DD")
 
-            result = mcp_server._export_hmrc_csv(account_id, start_date, end_date, filename)
+            result = await mcp_server._aexport_hmrc_csv(account_id, start_date, end_date, filename)
             validated_result = validate_tool_output("export_hmrc_csv", result)
 
             # Check if export was successful
@@ -1465,7 +2140,7 @@ def create_fastapi_app():
             export_data = validated_result.get("export", {})
             if export_data and "csv_path" in export_data:
                 csv_path = export_data["csv_path"]
-                return JSONResponse(content={
+                return APIJSONResponse(content={
                     "path": csv_path,
                     "total_transactions": export_data.get("metadata", {}).get("transaction_count", 0),
                     "total_amount": export_data.get("metadata", {}).get("net_total", 0),
@@ -1493,7 +2168,7 @@ def create_fastapi_app():
             if not mcp_server._validate_date_format(start_date) or not mcp_server._validate_date_format(end_date):
                 raise HTTPException(status_code=400, detail="Invalid date format. Use YYYY-MM-DD")
 
-            result = mcp_server._export_hmrc_csv(account_id, start_date, end_date, filename)
+            result = await mcp_server._aexport_hmrc_csv(account_id, start_date, end_date, filename)
             validated_result = validate_tool_output("export_hmrc_csv", result)
 
             # Check if export was successful
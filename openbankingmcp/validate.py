@@ -6,27 +6,86 @@ from typing import Dict, List, Any, Optional
 import json
 import sys
 
+# Optional fastjsonschema for checking a whole tool list in one compiled call
+try:
+    import fastjsonschema
+    FASTJSONSCHEMA_AVAILABLE = True
+except ImportError:
+    FASTJSONSCHEMA_AVAILABLE = False
+
+# Sentinel for keys whose value may legitimately be None
+_MISSING = object()
+
+_REQUIRED_TOOL_KEYS = frozenset(("name", "description", "inputSchema", "outputSchema"))
+
+# Never looser than assert_tool_schema; a list that fails it is re-checked
+# tool by tool so callers get the same errors as before.
+_TOOL_LIST_SCHEMA = {
+    "type": "array",
+    "items": {
+        "type": "object",
+        "required": sorted(_REQUIRED_TOOL_KEYS),
+        "properties": {
+            "outputSchema": {
+                "type": "object",
+                "required": ["properties"],
+                "properties": {
+                    "properties": {
+                        "type": "object",
+                        "required": ["content"],
+                        "properties": {
+                            "content": {
+                                "type": "object",
+                                "required": ["type"],
+                                "properties": {"type": {"const": "array"}}
+                            }
+                        }
+                    }
+                }
+            }
+        }
+    }
+}
+
+_TOOL_LIST_VALIDATOR = fastjsonschema.compile(_TOOL_LIST_SCHEMA) if FASTJSONSCHEMA_AVAILABLE else None
+
+
+def _tool_list_valid(tools: List[Dict[str, Any]]) -> bool:
+    """Return True if the compiled validator accepts the whole list in a single call."""
+    if _TOOL_LIST_VALIDATOR is None:
+        return False
+    try:
+        _TOOL_LIST_VALIDATOR(tools)
+        return True
+    except fastjsonschema.JsonSchemaException:
+        return False
+
 
 def assert_tool_schema(tool: Dict[str, Any]) -> None:
     """Validate that a tool conforms to MCP spec requirements."""
-    required_keys = ("name", "description", "inputSchema", "outputSchema")
+    if not isinstance(tool, dict):
+        raise ValueError("Tool must be an object")
 
-    for key in required_keys:
-        if key not in tool:
-            raise ValueError(f"Tool missing required key: {key}")
+    missing = _REQUIRED_TOOL_KEYS.difference(tool)
+    if missing:
+        raise ValueError(f"Tool missing required key: {', '.join(sorted(missing))}")
 
     # Validate outputSchema structure
     oschema = tool["outputSchema"]
     if not isinstance(oschema, dict):
         raise ValueError("outputSchema must be an object")
 
-    if "properties" not in oschema:
+    properties = oschema.get("properties", _MISSING)
+    if properties is _MISSING:
         raise ValueError("outputSchema must have 'properties'")
 
-    if "content" not in oschema["properties"]:
+    if not isinstance(properties, dict):
+        raise ValueError("outputSchema.properties must be an object")
+
+    content_schema = properties.get("content", _MISSING)
+    if content_schema is _MISSING:
         raise ValueError("outputSchema.properties must include 'content'")
 
-    content_schema = oschema["properties"]["content"]
     if not isinstance(content_schema, dict):
         raise ValueError("outputSchema.properties.content must be an object")
 
@@ -36,11 +95,15 @@ def assert_tool_schema(tool: Dict[str, Any]) -> None:
 
 def validate_tools(tools: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     """Validate all tools in a list."""
+    if _tool_list_valid(tools):
+        return tools
+
     for i, tool in enumerate(tools):
         try:
             assert_tool_schema(tool)
         except ValueError as e:
-            raise ValueError(f"Tool {i} ({tool.get('name', 'unnamed')}): {e}")
+            name = tool.get("name", "unnamed") if isinstance(tool, dict) else "unnamed"
+            raise ValueError(f"Tool {i} ({name}): {e}")
 
     return tools
 
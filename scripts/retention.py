@@ -7,90 +7,243 @@ open banking MCP tools. It can clean up old CSV files based on configurable
 retention periods.
 """
 
+import io
 import os
 import sys
-import glob
 import time
 import argparse
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from datetime import datetime, timedelta
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator, Optional, Tuple
 import json
 
+# Delete relative to an open directory handle where the platform supports it
+_UNLINK_DIR_FD = os.unlink in os.supports_dir_fd and hasattr(os, "O_DIRECTORY")
+
+# Recursive scans switch to a thread pool once this many directories are waiting;
+# smaller trees are walked on the calling thread
+PARALLEL_SCAN_MIN_DIRS = 8
+SCAN_MAX_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+# How long generate_report may reuse the last analysis instead of walking the tree again
+ANALYSIS_CACHE_TTL_SECONDS = 5
+
+
+def _format_size(size_bytes: Optional[int]) -> str:
+    """Format a file size for the report, allowing for sizes that were never read."""
+    return "size unknown" if size_bytes is None else f"{size_bytes} bytes"
+
 
 class RetentionEnforcer:
     """Manages CSV file retention and cleanup."""
 
-    def __init__(self, base_directory: str = ".", retention_days: int = 30):
+    def __init__(self, base_directory: str = ".", retention_days: int = 30, recursive: bool = False,
+                 conservative: bool = True):
         """
         Initialize the retention enforcer.
 
         Args:
             base_directory: Directory to search for CSV files
             retention_days: Number of days to retain CSV files
+            recursive: Also search subdirectories of the base directory
+            conservative: Stat every file. When False, a directory whose own mtime is
+                older than the threshold has every CSV in it treated as old without
+                a per-file stat (see _scan_directory)
         """
         self.base_directory = base_directory
         self.retention_days = retention_days
+        self.recursive = recursive
+        self.conservative = conservative
         self.retention_threshold = datetime.now() - timedelta(days=retention_days)
+        # Compare raw st_mtime floats against this rather than building datetimes per file
+        self._threshold_epoch = self.retention_threshold.timestamp()
+        self.cache_ttl_seconds = ANALYSIS_CACHE_TTL_SECONDS
+        # (time.monotonic() when taken, analysis) from the last analyze_csv_files call
+        self._analysis_cache: Optional[Tuple[float, Dict[str, Any]]] = None
 
-    def find_csv_files(self) -> List[str]:
-        """Find all CSV files in the base directory."""
-        csv_patterns = [
-            "*.csv",
-            "hmrc_export_*.csv",
-            "test_*.csv"
-        ]
+    def _scan_directory(self, directory: str) -> Tuple[List[os.DirEntry], List[str], Optional[float]]:
+        """
+        Scan one directory, returning its CSV entries, (when recursive) its subdirectories,
+        and its mtime if the whole directory counts as aged.
+
+        Entries already know their file type, so no extra stat call is needed
+        per entry, and their stat() result is cached on the entry. Hidden
+        entries are skipped, as glob does.
+
+        A directory's mtime changes whenever an entry is added, removed or
+        renamed, so when it is older than the threshold every file in it was
+        created before then. That is only "old" if nothing was rewritten in
+        place since, so the shortcut is skipped unless conservative is False.
+        A newer directory mtime says nothing about the files already in it,
+        so those directories are always scanned file by file.
+        """
+        csv_entries = []
+        subdirectories = []
+        aged_mtime = None
 
-        csv_files = []
-        for pattern in csv_patterns:
-            full_pattern = os.path.join(self.base_directory, pattern)
-            csv_files.extend(glob.glob(full_pattern))
+        try:
+            if not self.conservative:
+                dir_mtime = os.stat(directory).st_mtime
+                if dir_mtime < self._threshold_epoch:
+                    aged_mtime = dir_mtime
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    name = entry.name
+                    if name.startswith("."):
+                        continue
+                    if entry.is_file(follow_symlinks=False):
+                        if name.endswith(".csv"):
+                            csv_entries.append(entry)
+                    elif self.recursive and entry.is_dir(follow_symlinks=False):
+                        subdirectories.append(entry.path)
+        except OSError as e:
+            print(f"⚠️ Could not scan directory {directory}: {e}")
 
-        return csv_files
+        return csv_entries, subdirectories, aged_mtime
+
+    def _iter_csv_entries(self, directory: Optional[str] = None) -> Iterator[Tuple[os.DirEntry, Optional[float]]]:
+        """
+        Yield the scandir entries of CSV files in a directory (the base directory by default),
+        each paired with its directory's mtime if that directory counts as aged.
+        """
+        pending = [self.base_directory if directory is None else directory]
+
+        while pending:
+            if len(pending) >= PARALLEL_SCAN_MIN_DIRS:
+                yield from self._iter_csv_entries_parallel(pending)
+                return
+
+            csv_entries, subdirectories, aged_mtime = self._scan_directory(pending.pop())
+            for entry in csv_entries:
+                yield entry, aged_mtime
+            # Depth-first, in scandir order
+            pending.extend(reversed(subdirectories))
+
+    def _iter_csv_entries_parallel(self, pending: List[str]) -> Iterator[Tuple[os.DirEntry, Optional[float]]]:
+        """Scan the pending directories and everything below them on a bounded thread pool."""
+        with ThreadPoolExecutor(max_workers=SCAN_MAX_WORKERS) as executor:
+            futures = {executor.submit(self._scan_directory, directory) for directory in pending}
+            while futures:
+                done, futures = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    csv_entries, subdirectories, aged_mtime = future.result()
+                    for entry in csv_entries:
+                        yield entry, aged_mtime
+                    futures.update(executor.submit(self._scan_directory, directory) for directory in subdirectories)
+
+    def iter_csv_files(self, directory: Optional[str] = None) -> Iterator[str]:
+        """Yield the paths of CSV files in a directory (the base directory by default)."""
+        for entry, _ in self._iter_csv_entries(directory):
+            yield entry.path
 
-    def get_file_age(self, file_path: str) -> datetime:
-        """Get the creation/modification time of a file."""
+    def find_csv_files(self) -> List[str]:
+        """Find all CSV files in the base directory."""
+        return list(self.iter_csv_files())
+
+    def get_file_age(self, file_path: str, stat_result: Optional[os.stat_result] = None) -> datetime:
+        """Get the creation/modification time of a file, reusing stat_result if given."""
         try:
+            if stat_result is None:
+                stat_result = os.stat(file_path)
             # Use modification time as a proxy for creation time
-            timestamp = os.path.getmtime(file_path)
-            return datetime.fromtimestamp(timestamp)
+            return datetime.fromtimestamp(stat_result.st_mtime)
         except OSError as e:
             print(f"⚠️ Could not get file age for {file_path}: {e}")
             return datetime.min
 
-    def is_file_old(self, file_path: str) -> bool:
+    def is_file_old(self, file_path: str, stat_result: Optional[os.stat_result] = None) -> bool:
         """Check if a file is older than the retention threshold."""
-        file_age = self.get_file_age(file_path)
-        return file_age < self.retention_threshold
+        try:
+            if stat_result is None:
+                stat_result = os.stat(file_path)
+        except OSError as e:
+            # An unreadable file counts as old, as it has no datetime to compare
+            print(f"⚠️ Could not get file age for {file_path}: {e}")
+            return True
+        return stat_result.st_mtime < self._threshold_epoch
+
+    def _build_file_info(self, file_path: str, entry: Optional[os.DirEntry] = None,
+                         aged_mtime: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Describe one file for the analysis from its scandir entry, or one stat call.
+
+        A file in an aged directory (aged_mtime set) is old without being
+        stat'd; its size is unknown (None) and its modified time is reported
+        as the directory's mtime, which it cannot be newer than.
+        """
+        if aged_mtime is not None:
+            return {
+                "path": file_path,
+                "filename": os.path.basename(file_path),
+                "size_bytes": None,
+                "modified_time": datetime.fromtimestamp(aged_mtime).isoformat(),
+                "is_old": True
+            }
+
+        try:
+            stat_result = os.stat(file_path) if entry is None else entry.stat(follow_symlinks=False)
+        except OSError as e:
+            print(f"⚠️ Could not get file age for {file_path}: {e}")
+            size_bytes, modified_time, is_old = 0, datetime.min, True
+        else:
+            size_bytes = stat_result.st_size
+            modified_time = datetime.fromtimestamp(stat_result.st_mtime)
+            is_old = stat_result.st_mtime < self._threshold_epoch
+
+        return {
+            "path": file_path,
+            "filename": os.path.basename(file_path),
+            "size_bytes": size_bytes,
+            "modified_time": modified_time.isoformat(),
+            "is_old": is_old
+        }
 
     def analyze_csv_files(self) -> Dict[str, Any]:
         """Analyze CSV files and categorize them by age."""
-        csv_files = self.find_csv_files()
+        csv_entries = list(self._iter_csv_entries())
 
         analysis = {
-            "total_files": len(csv_files),
+            "total_files": len(csv_entries),
             "old_files": [],
             "recent_files": [],
             "retention_threshold": self.retention_threshold.isoformat(),
             "retention_days": self.retention_days
         }
 
-        for file_path in csv_files:
-            file_info = {
-                "path": file_path,
-                "filename": os.path.basename(file_path),
-                "size_bytes": os.path.getsize(file_path) if os.path.exists(file_path) else 0,
-                "modified_time": self.get_file_age(file_path).isoformat(),
-                "is_old": False
-            }
-
-            if self.is_file_old(file_path):
-                file_info["is_old"] = True
+        for entry, aged_mtime in csv_entries:
+            file_info = self._build_file_info(entry.path, entry, aged_mtime)
+            if file_info["is_old"]:
                 analysis["old_files"].append(file_info)
             else:
                 analysis["recent_files"].append(file_info)
 
+        self._analysis_cache = (time.monotonic(), analysis)
         return analysis
 
+    def invalidate_cache(self) -> None:
+        """Forget the cached analysis, so the next report walks the tree again."""
+        self._analysis_cache = None
+
+    def _get_analysis(self) -> Dict[str, Any]:
+        """Return the last analysis if it is younger than cache_ttl_seconds, else a fresh one."""
+        if self._analysis_cache is not None:
+            taken_at, analysis = self._analysis_cache
+            if time.monotonic() - taken_at < self.cache_ttl_seconds:
+                return analysis
+        return self.analyze_csv_files()
+
+    def _unlink(self, file_path: str, dir_fds: Dict[str, int]) -> None:
+        """Delete a file by name relative to a cached handle on its directory."""
+        if not _UNLINK_DIR_FD:
+            os.remove(file_path)
+            return
+
+        directory, name = os.path.split(file_path)
+        dir_fd = dir_fds.get(directory)
+        if dir_fd is None:
+            dir_fd = dir_fds[directory] = os.open(directory or ".", os.O_RDONLY | os.O_DIRECTORY)
+        os.unlink(name, dir_fd=dir_fd)
+
     def cleanup_old_files(self, dry_run: bool = True) -> Dict[str, Any]:
         """
         Clean up old CSV files.
@@ -109,34 +262,48 @@ class RetentionEnforcer:
             "files_processed": len(old_files),
             "files_deleted": 0,
             "errors": [],
-            "deleted_files": []
+            "deleted_files": [],
+            # Files deleted without a known size, left out of the totals below
+            "files_size_unknown": 0
         }
 
         total_size_freed = 0
+        # One open handle per directory, shared by every delete in it
+        dir_fds: Dict[str, int] = {}
 
-        for file_info in old_files:
-            file_path = file_info["path"]
-            file_size = file_info["size_bytes"]
-
-            try:
-                if not dry_run:
-                    os.remove(file_path)
-                    results["files_deleted"] += 1
-                    results["deleted_files"].append({
-                        "path": file_path,
-                        "size_bytes": file_size,
-                        "deleted_at": datetime.now().isoformat()
-                    })
-                    total_size_freed += file_size
-                    print(f"🗑️ Deleted: {file_path} ({file_size} bytes)")
-                else:
-                    print(f"📋 Would delete: {file_path} ({file_size} bytes)")
-                    results["files_deleted"] += 1
-
-            except OSError as e:
-                error_msg = f"Failed to delete {file_path}: {e}"
-                results["errors"].append(error_msg)
-                print(f"❌ {error_msg}")
+        try:
+            for file_info in old_files:
+                file_path = file_info["path"]
+                file_size = file_info["size_bytes"]
+
+                try:
+                    if not dry_run:
+                        self._unlink(file_path, dir_fds)
+                        results["files_deleted"] += 1
+                        results["deleted_files"].append({
+                            "path": file_path,
+                            "size_bytes": file_size,
+                            "deleted_at": datetime.now().isoformat()
+                        })
+                        print(f"🗑️ Deleted: {file_path} ({_format_size(file_size)})")
+                    else:
+                        print(f"📋 Would delete: {file_path} ({_format_size(file_size)})")
+                        results["files_deleted"] += 1
+
+                    if file_size is None:
+                        results["files_size_unknown"] += 1
+                    elif not dry_run:
+                        total_size_freed += file_size
+
+                except OSError as e:
+                    error_msg = f"Failed to delete {file_path}: {e}"
+                    results["errors"].append(error_msg)
+                    print(f"❌ {error_msg}")
+        finally:
+            for dir_fd in dir_fds.values():
+                os.close(dir_fd)
+            if not dry_run:
+                self.invalidate_cache()
 
         results["total_size_freed_bytes"] = total_size_freed
         results["total_size_freed_mb"] = round(total_size_freed / (1024 * 1024), 2)
@@ -181,10 +348,12 @@ class RetentionEnforcer:
             return False
 
     def generate_report(self) -> str:
-        """Generate a human-readable retention report."""
-        analysis = self.analyze_csv_files()
+        """Generate a human-readable retention report, reusing a recent analysis if there is one."""
+        analysis = self._get_analysis()
+        report = io.StringIO()
+        write = report.write
 
-        report = f"""
+        write(f"""
 CSV File Retention Report
 ========================
 Generated: {datetime.now().isoformat()}
@@ -200,26 +369,26 @@ Recent files: {len(analysis['recent_files'])}
 
 Old Files (candidates for deletion):
 -----------------------------------
-"""
+""")
 
         if analysis['old_files']:
             for file_info in analysis['old_files']:
-                report += f"- {file_info['filename']} ({file_info['size_bytes']} bytes, modified: {file_info['modified_time']})\n"
+                write(f"- {file_info['filename']} ({_format_size(file_info['size_bytes'])}, modified: {file_info['modified_time']})\n")
         else:
-            report += "No old files found.\n"
+            write("No old files found.\n")
 
-        report += f"""
+        write("""
 Recent Files (within retention period):
 -------------------------------------
-"""
+""")
 
         if analysis['recent_files']:
             for file_info in analysis['recent_files']:
-                report += f"- {file_info['filename']} ({file_info['size_bytes']} bytes, modified: {file_info['modified_time']})\n"
+                write(f"- {file_info['filename']} ({_format_size(file_info['size_bytes'])}, modified: {file_info['modified_time']})\n")
         else:
-            report += "No recent files found.\n"
+            write("No recent files found.\n")
 
-        return report
+        return report.getvalue()
 
 
 def main():
@@ -234,6 +403,8 @@ Examples:
   %(prog)s --cleanup                    # Actually delete old files
   %(prog)s --test-deletion              # Test deletion functionality
   %(prog)s --retention-days 7 --cleanup # Use 7-day retention period
+  %(prog)s --recursive --analyze        # Include subdirectories
+  %(prog)s -R --trust-directory-mtime --cleanup  # Skip per-file stats in aged folders
         """
     )
 
@@ -250,6 +421,19 @@ Examples:
         help="Number of days to retain CSV files (default: 30)"
     )
 
+    parser.add_argument(
+        "--recursive", "-R",
+        action="store_true",
+        help="Also search subdirectories of the base directory"
+    )
+
+    parser.add_argument(
+        "--trust-directory-mtime",
+        action="store_true",
+        help="Treat every CSV in a directory not modified within the retention period as old, "
+             "without checking each file (files rewritten in place are missed; sizes are unknown)"
+    )
+
     parser.add_argument(
         "--analyze", "-a",
         action="store_true",
@@ -283,7 +467,12 @@ Examples:
     args = parser.parse_args()
 
     # Initialize retention enforcer
-    enforcer = RetentionEnforcer(args.base_directory, args.retention_days)
+    enforcer = RetentionEnforcer(
+        args.base_directory,
+        args.retention_days,
+        args.recursive,
+        conservative=not args.trust_directory_mtime
+    )
 
     # Handle different operations
     if args.test_deletion:
@@ -320,6 +509,8 @@ Examples:
             print(f"Files processed: {results['files_processed']}")
             print(f"Files {'would be ' if dry_run else ''}deleted: {results['files_deleted']}")
             print(f"Total size freed: {results['total_size_freed_mb']} MB")
+            if results['files_size_unknown']:
+                print(f"(excludes {results['files_size_unknown']} file(s) of unknown size)")
 
             if results['errors']:
                 print(f"\nErrors encountered:")
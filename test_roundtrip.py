@@ -11,16 +11,20 @@ import os
 # Add current directory to path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
+# Built once; every rpc() call starts the same command
+SERVER_ARGV = (sys.executable, "-m", "server")
+
 
 def rpc(req: dict) -> dict:
     """Send RPC request to server and return response."""
     p = subprocess.run(
-        [sys.executable, "-m", "server"],
+        SERVER_ARGV,
         input=json.dumps(req).encode(),
         capture_output=True,
         check=True
     )
-    line = p.stdout.decode().splitlines()[0]
+    # Only the first line is the response; don't decode and split the rest
+    line = p.stdout.split(b"\n", 1)[0]
     return json.loads(line)
 
 
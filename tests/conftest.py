@@ -0,0 +1,43 @@
+"""
+Shared fixtures for the MCP server tests.
+"""
+import os
+import sys
+import pytest
+
+# Add current directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tests.helpers import (
+    LIST_ACCOUNTS_BYTES, export_csv_path, hmrc_export_request,
+    read_export_csv, rpc, rpc_bytes, start_server, stop_server
+)
+
+
+@pytest.fixture(scope="session")
+def server_proc(tmp_path_factory):
+    """One MCP server process shared by every RPC test in the session."""
+    proc = start_server(cwd=tmp_path_factory.mktemp("mcp_server"))
+    yield proc
+    stop_server(proc)
+
+
+@pytest.fixture(scope="module")
+def list_accounts_response(server_proc):
+    """One list_accounts response shared by a test module."""
+    return rpc_bytes(server_proc, LIST_ACCOUNTS_BYTES)
+
+
+@pytest.fixture(scope="module")
+def hmrc_export_response(server_proc, tmp_path_factory):
+    """One export_hmrc_csv response and the path of the CSV it wrote."""
+    csv_path = tmp_path_factory.mktemp("hmrc_export") / "hmrc_export.csv"
+    res = rpc(server_proc, hmrc_export_request(csv_path))
+    return res, export_csv_path(res)
+
+
+@pytest.fixture(scope="module")
+def hmrc_export_csv(hmrc_export_response):
+    """Headers and rows of the shared export, parsed once per module."""
+    _, csv_path = hmrc_export_response
+    return read_export_csv(csv_path)
@@ -0,0 +1,174 @@
+"""
+Plain helpers shared by the MCP server tests: server process control, RPC
+framing, request constants and compiled response validators.
+"""
+import csv
+import json
+import subprocess
+import sys
+import fastjsonschema
+
+from openbankingmcp.schemas import ACCOUNT_SCHEMA, LIST_TRANSACTIONS_OUTPUT_SCHEMA, TRANSACTION_SCHEMA
+
+# Prefer orjson for RPC traffic; it encodes straight to bytes
+try:
+    import orjson
+    json_dumps = orjson.dumps
+    json_loads = orjson.loads
+except ImportError:
+    def json_dumps(obj) -> bytes:
+        return json.dumps(obj).encode()
+    json_loads = json.loads
+
+# Command line of the MCP server under test, shared by every way of starting it
+SERVER_ARGV = (sys.executable, "-m", "openbankingmcp.server")
+
+
+def _require_non_empty(schema: dict, fields) -> dict:
+    """Copy an object schema, requiring the given string fields to be non-empty."""
+    properties = dict(schema["properties"])
+    for field in fields:
+        properties[field] = {**properties[field], "minLength": 1}
+    return {**schema, "properties": properties}
+
+
+# The shared tool schemas, tightened with the extra guarantees the RPC tests check,
+# and compiled once so each response is validated in a single call
+_STRICT_ACCOUNT_SCHEMA = _require_non_empty(ACCOUNT_SCHEMA, ("id", "name", "type", "currency"))
+_STRICT_TRANSACTION_SCHEMA = _require_non_empty(TRANSACTION_SCHEMA, ("id", "date", "description", "account_id"))
+_STRICT_TRANSACTION_SCHEMA["properties"]["date"]["pattern"] = r"^\d{4}-\d{2}-\d{2}$"
+_PAGINATION_SCHEMA = LIST_TRANSACTIONS_OUTPUT_SCHEMA["properties"]["pagination"]
+_STRICT_PAGINATION_SCHEMA = {
+    **_PAGINATION_SCHEMA,
+    "properties": {
+        **_PAGINATION_SCHEMA["properties"],
+        "total": {"type": "integer", "minimum": 0},
+        "page": {"type": "integer", "minimum": 1},
+        "limit": {"type": "integer", "exclusiveMinimum": 0}
+    },
+    # Responses also report the offset they were asked for
+    "additionalProperties": True
+}
+
+validate_account_list = fastjsonschema.compile({"type": "array", "items": _STRICT_ACCOUNT_SCHEMA})
+validate_transaction_list = fastjsonschema.compile({"type": "array", "items": _STRICT_TRANSACTION_SCHEMA})
+validate_pagination = fastjsonschema.compile(_STRICT_PAGINATION_SCHEMA)
+
+
+def start_server(cwd=None) -> subprocess.Popen:
+    """Start a long-lived MCP server speaking line-delimited JSON-RPC over stdio."""
+    return subprocess.Popen(
+        SERVER_ARGV,
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        # Server logs are verbose; discard them so a full stderr pipe can't block it
+        stderr=subprocess.DEVNULL,
+        cwd=cwd,
+        bufsize=0
+    )
+
+
+def stop_server(proc: subprocess.Popen):
+    """Close the server's stdin and wait for it to exit."""
+    proc.stdin.close()
+    try:
+        proc.wait(timeout=5)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+        proc.wait()
+    proc.stdout.close()
+
+
+def rpc(proc, req: dict) -> dict:
+    """Send RPC request to the running server and return its response."""
+    proc.stdin.write(json_dumps(req) + b"\n")
+    proc.stdin.flush()
+    line = proc.stdout.readline()
+    if not line:
+        raise RuntimeError("MCP server exited before responding")
+    return json_loads(line)
+
+
+def rpc_bytes(proc, payload: bytes) -> dict:
+    """Send a pre-encoded request line to the running server and return its response."""
+    proc.stdin.write(payload)
+    proc.stdin.flush()
+    line = proc.stdout.readline()
+    if not line:
+        raise RuntimeError("MCP server exited before responding")
+    return json_loads(line)
+
+
+def rpc_pipeline(proc, reqs) -> list:
+    """Pipeline several requests to the running server and return their responses in request order.
+
+    All requests are written in one go before any response is read. The server
+    may answer them out of order, so each request is given a distinct id and the
+    responses are matched back by it.
+    """
+    proc.stdin.write(b"".join(encode_request({**req, "id": i}) for i, req in enumerate(reqs)))
+    proc.stdin.flush()
+    responses = [None] * len(reqs)
+    for _ in reqs:
+        line = proc.stdout.readline()
+        if not line:
+            raise RuntimeError("MCP server exited before responding")
+        res = json_loads(line)
+        responses[res["id"]] = res
+    return responses
+
+
+def encode_request(req: dict) -> bytes:
+    """Encode a request as one line of JSON-RPC, ready for rpc_bytes."""
+    return json_dumps(req) + b"\n"
+
+
+def tool_call(name: str, arguments: dict, request_id: int = 1) -> dict:
+    """Build a tools/call JSON-RPC request."""
+    return {
+        "jsonrpc": "2.0",
+        "id": request_id,
+        "method": "tools/call",
+        "params": {
+            "name": name,
+            "arguments": arguments
+        }
+    }
+
+
+# Requests whose responses are shared by every test in a module
+LIST_ACCOUNTS_REQUEST = tool_call("list_accounts", {})
+TOOLS_LIST_REQUEST = {"jsonrpc": "2.0", "id": 1, "method": "tools/list", "params": {}}
+LIST_TRANSACTIONS_REQUEST = tool_call("list_transactions", {
+    "account_id": "test123",
+    "start_date": "2024-09-01",
+    "end_date": "2024-09-30"
+})
+HMRC_EXPORT_ARGUMENTS = {
+    "account_id": "test123",
+    "start_date": "2024-09-01",
+    "end_date": "2024-09-19"
+}
+
+
+# Fully static requests, encoded once at import
+LIST_ACCOUNTS_BYTES = encode_request(LIST_ACCOUNTS_REQUEST)
+
+
+def hmrc_export_request(csv_path) -> dict:
+    """Build the shared export request, writing to an absolute csv_path."""
+    return tool_call("export_hmrc_csv", {**HMRC_EXPORT_ARGUMENTS, "filename": str(csv_path)})
+
+
+def export_csv_path(res: dict) -> str:
+    """Return the csv_path reported in an export response."""
+    result_data = json_loads(res["result"]["content"][0]["text"])
+    return result_data["export"]["csv_path"]
+
+
+def read_export_csv(csv_path: str):
+    """Parse an exported CSV into (headers, rows)."""
+    with open(csv_path, newline="", encoding="utf-8") as f:
+        reader = csv.DictReader(f)
+        rows = list(reader)
+    return reader.fieldnames, rows
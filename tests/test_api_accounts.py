@@ -3,6 +3,7 @@ Integration tests for /api/accounts endpoint.
 """
 import pytest
 from fastapi.testclient import TestClient
+import openbankingmcp.server as server_module
 from openbankingmcp.server import create_fastapi_app
 
 
@@ -97,3 +98,33 @@ def test_get_accounts_returns_dummy_data(client):
     assert acc002["name"] == "Business Savings"
     assert acc002["type"] == "savings"
     assert acc002["balance"] == 15750.00
+
+
+def test_accounts_response_content_type(client):
+    """Test that the orjson-backed response still declares plain application/json."""
+    response = client.get("/api/accounts")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+
+
+def test_api_response_encodes_numpy_values():
+    """Test that the API response class serializes numpy scalars from pandas."""
+    np = pytest.importorskip("numpy")
+    if not server_module.ORJSON_AVAILABLE:
+        pytest.skip("orjson not installed")
+
+    response = server_module.APIJSONResponse(content={"total": np.float64(1.5), "count": np.int64(2)})
+
+    assert response.body == b'{"total":1.5,"count":2}'
+
+
+def test_list_accounts_returns_independent_copies():
+    """Test that mutating a returned account does not change later responses."""
+    server = server_module.MCPServer()
+    first = server._list_accounts()["accounts"]
+    first[0]["balance"] = -1
+    first.append({"id": "extra"})
+
+    assert server._list_accounts()["accounts"] == server_module._DUMMY_ACCOUNTS_VALIDATED
+    assert server_module._DUMMY_ACCOUNTS_VALIDATED[0]["balance"] != -1
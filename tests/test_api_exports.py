@@ -5,6 +5,7 @@ import pytest
 import os
 import tempfile
 from fastapi.testclient import TestClient
+import openbankingmcp.server as server_module
 from openbankingmcp.server import create_fastapi_app
 
 
@@ -246,3 +247,27 @@ def test_export_creates_valid_csv_file(client):
     # Clean up
     if os.path.exists(csv_path):
         os.remove(csv_path)
+
+
+def test_export_endpoints_await_the_paged_fetch(client, monkeypatch, tmp_path):
+    """Test that the async export endpoints await the paged fetch instead of blocking on the sync bridge."""
+    def sync_fetch(*args, **kwargs):
+        raise AssertionError("async handler used the synchronous fetch path")
+
+    async def fetch_all_pages(self, token, account_id, start_date, end_date, limit=50):
+        return [{**txn, "account_id": account_id} for txn in server_module._MOCK_TRANSACTIONS]
+
+    monkeypatch.setattr(server_module, "_run_coroutine_sync", sync_fetch)
+    monkeypatch.setattr(server_module.MCPServer, "_get_transactions_data", sync_fetch)
+    monkeypatch.setattr(server_module.MCPServer, "_get_truelayer_token", lambda self: "token")
+    monkeypatch.setattr(server_module.MCPServer, "_afetch_truelayer_transactions_all_pages", fetch_all_pages)
+    monkeypatch.chdir(tmp_path)
+    params = {"account_id": "business", "start_date": "2025-09-01", "end_date": "2025-09-30"}
+
+    response = client.get("/api/exports/hmrc", params=params)
+    assert response.status_code == 200
+    assert response.json()["total_transactions"] == len(server_module._MOCK_TRANSACTIONS)
+
+    response = client.get("/api/exports/hmrc/download", params=params)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
@@ -167,3 +167,16 @@ def test_get_transactions_returns_normalized_data(client):
 
         # Account ID should match request
         assert transaction["account_id"] == "business"
+
+
+def test_get_transactions_body_is_compact_json(client):
+    """Test that the pre-serialized body is compact JSON with the right content type."""
+    response = client.get("/api/transactions", params={
+        "account_id": "business",
+        "start_date": "2025-09-01",
+        "end_date": "2025-09-30"
+    })
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    assert response.content.startswith(b'{"transactions":[')
@@ -0,0 +1,53 @@
+"""
+Tests for keyword-based HMRC categorization in MCPServer.
+"""
+import pytest
+import openbankingmcp.server as server_module
+from openbankingmcp.server import MCPServer
+
+
+@pytest.fixture(params=["automaton", "regex"])
+def server(request, monkeypatch):
+    """Create MCP server using either the Aho-Corasick or the regex matcher."""
+    if request.param == "automaton":
+        pytest.importorskip("ahocorasick")
+    else:
+        monkeypatch.setattr(server_module, "AHOCORASICK_AVAILABLE", False)
+    return MCPServer()
+
+
+@pytest.mark.parametrize("description,expected", [
+    ("MONTHLY SALARY", "Income"),
+    ("Stripe payout", "Income"),
+    ("Savings interest", "Bank Interest"),
+    ("UBER TRIP", "Travel"),
+    ("TfL travel", "Travel"),
+    ("Local cafe", "Office Costs"),
+    ("British Gas", "Utilities"),
+    ("Transferwise fee", "Bank charges"),
+    ("Corner shop", "General expenses"),
+    ("", "General expenses"),
+])
+def test_keyword_categories(server, description, expected):
+    """Test that descriptions map onto the expected HMRC buckets."""
+    assert server._categorize_transaction({"description": description}) == expected
+
+
+def test_earlier_bucket_wins_regardless_of_position(server):
+    """Test that bucket priority, not keyword position, picks the category."""
+    # "fee" appears first but Income outranks Bank charges
+    assert server._categorize_transaction({"description": "fee on invoice"}) == "Income"
+    # Overlapping keywords: "interest" starts inside "train"
+    assert server._categorize_transaction({"description": "trainterest"}) == "Bank Interest"
+
+
+def test_merchant_name_is_matched(server):
+    """Test that merchant_name participates in keyword matching."""
+    transaction = {"description": "Card payment", "merchant_name": "Uber"}
+    assert server._categorize_transaction(transaction) == "Travel"
+
+
+def test_existing_category_is_normalized(server):
+    """Test that an existing category short-circuits keyword matching."""
+    transaction = {"description": "salary", "category": "groceries"}
+    assert server._categorize_transaction(transaction) == "General expenses"
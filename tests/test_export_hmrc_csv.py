@@ -4,328 +4,139 @@ Tests for the export_hmrc_csv tool functionality.
 """
 
 import json
-import subprocess
+import re
 import sys
 import os
-import csv
-import tempfile
 
 # Add current directory to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from tests.helpers import export_csv_path
+from openbankingmcp.hmrc import get_valid_hmrc_categories
 
-def rpc(req: dict) -> dict:
-    """Send RPC request to server and return response."""
-    p = subprocess.run(
-        [sys.executable, "-m", "openbankingmcp.server"],
-        input=json.dumps(req).encode(),
-        capture_output=True,
-        check=True
-    )
-    line = p.stdout.decode().splitlines()[0]
-    return json.loads(line)
+VALID_HMRC_CATEGORIES = frozenset(get_valid_hmrc_categories())
+_UK_DATE_RE = re.compile(r"\d{1,2}/\d{1,2}/\d{4}")
 
 
-def test_export_hmrc_csv_creates_file():
+def test_export_hmrc_csv_creates_file(hmrc_export_response):
     """Test that export_hmrc_csv creates a CSV file with correct structure."""
-    # Use a temporary directory for the test
-    with tempfile.TemporaryDirectory() as temp_dir:
-        original_cwd = os.getcwd()
-        os.chdir(temp_dir)
-
-        try:
-            res = rpc({
-                "jsonrpc": "2.0",
-                "id": 1,
-                "method": "tools/call",
-                "params": {
-                    "name": "export_hmrc_csv",
-                    "arguments": {
-                        "account_id": "test123",
-                        "start_date": "2024-09-01",
-                        "end_date": "2024-09-19",
-                        "filename": "test_export.csv"
-                    }
-                }
-            })
-
-            # Check response format
-            assert "result" in res
-            assert "content" in res["result"]
-            content = res["result"]["content"]
-            assert isinstance(content, list) and len(content) > 0
-            assert content[0]["type"] == "text"
-
-            # Check that CSV file was created
-            csv_files = [f for f in os.listdir(".") if f.endswith(".csv")]
-            assert len(csv_files) > 0, "No CSV file was created"
-
-            # Check filename
-            assert "test_export.csv" in csv_files or any("hmrc_export" in f for f in csv_files)
-
-            print("✅ CSV file creation test passed")
-
-        finally:
-            os.chdir(original_cwd)
-
-
-def test_csv_has_correct_headers():
+    # The shared export asks for an absolute path, so the file is found without scanning a directory
+    res, expected_path = hmrc_export_response
+
+    # Check response format
+    assert "result" in res
+    assert "content" in res["result"]
+    content = res["result"]["content"]
+    assert isinstance(content, list) and len(content) > 0
+    assert content[0]["type"] == "text"
+
+    # Check that the CSV file was created where requested
+    assert os.path.basename(export_csv_path(res)) == "hmrc_export.csv"
+    assert os.path.isfile(expected_path), "No CSV file was created"
+
+    print("✅ CSV file creation test passed")
+
+
+def test_csv_has_correct_headers(hmrc_export_csv):
     """Test that the CSV has the correct headers."""
-    with tempfile.TemporaryDirectory() as temp_dir:
-        original_cwd = os.getcwd()
-        os.chdir(temp_dir)
-
-        try:
-            res = rpc({
-                "jsonrpc": "2.0",
-                "id": 2,
-                "method": "tools/call",
-                "params": {
-                    "name": "export_hmrc_csv",
-                    "arguments": {
-                        "account_id": "test123",
-                        "start_date": "2024-09-01",
-                        "end_date": "2024-09-19"
-                    }
-                }
-            })
-
-            # Find the CSV file
-            csv_files = [f for f in os.listdir(".") if f.endswith(".csv")]
-            assert len(csv_files) > 0
-
-            csv_file = csv_files[0]
-
-            # Read and check headers
-            with open(csv_file, 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                headers = reader.fieldnames
-
-                expected_headers = ["Date", "Description", "Amount", "Currency", "HMRC Category"]
-                assert headers == expected_headers, f"Expected {expected_headers}, got {headers}"
-
-            print("✅ CSV headers test passed")
-
-        finally:
-            os.chdir(original_cwd)
-
-
-def test_date_format_conversion():
+    headers, _ = hmrc_export_csv
+
+    expected_headers = ["Date", "Description", "Amount", "Currency", "HMRC Category"]
+    assert headers == expected_headers, f"Expected {expected_headers}, got {headers}"
+
+    print("✅ CSV headers test passed")
+
+
+def test_date_format_conversion(hmrc_export_csv):
     """Test that dates are converted from YYYY-MM-DD to DD/MM/YYYY format."""
-    with tempfile.TemporaryDirectory() as temp_dir:
-        original_cwd = os.getcwd()
-        os.chdir(temp_dir)
-
-        try:
-            res = rpc({
-                "jsonrpc": "2.0",
-                "id": 3,
-                "method": "tools/call",
-                "params": {
-                    "name": "export_hmrc_csv",
-                    "arguments": {
-                        "account_id": "test123",
-                        "start_date": "2024-09-01",
-                        "end_date": "2024-09-19"
-                    }
-                }
-            })
-
-            # Find the CSV file
-            csv_files = [f for f in os.listdir(".") if f.endswith(".csv")]
-            csv_file = csv_files[0]
-
-            # Check date format in CSV
-            with open(csv_file, 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                rows = list(reader)
-
-                # Check that dates are in DD/MM/YYYY format
-                for row in rows:
-                    date_str = row["Date"]
-                    if date_str and "/" in date_str:
-                        # Should be in DD/MM/YYYY format
-                        parts = date_str.split("/")
-                        assert len(parts) == 3, f"Date should have 3 parts separated by /, got: {date_str}"
-                        assert len(parts[0]) <= 2, f"Day should be 1-2 digits, got: {parts[0]}"
-                        assert len(parts[1]) <= 2, f"Month should be 1-2 digits, got: {parts[1]}"
-                        assert len(parts[2]) == 4, f"Year should be 4 digits, got: {parts[2]}"
-
-            print("✅ Date format conversion test passed")
-
-        finally:
-            os.chdir(original_cwd)
-
-
-def test_summary_contains_keywords():
+    _, rows = hmrc_export_csv
+
+    # Check that dates are in DD/MM/YYYY format
+    for row in rows:
+        date_str = row["Date"]
+        if date_str and "/" in date_str:
+            # Should be in DD/MM/YYYY format
+            assert _UK_DATE_RE.fullmatch(date_str), f"Date should be DD/MM/YYYY, got: {date_str}"
+
+    print("✅ Date format conversion test passed")
+
+
+def test_summary_contains_keywords(hmrc_export_response):
     """Test that the summary contains expected keywords."""
-    with tempfile.TemporaryDirectory() as temp_dir:
-        original_cwd = os.getcwd()
-        os.chdir(temp_dir)
-
-        try:
-            res = rpc({
-                "jsonrpc": "2.0",
-                "id": 4,
-                "method": "tools/call",
-                "params": {
-                    "name": "export_hmrc_csv",
-                    "arguments": {
-                        "account_id": "test123",
-                        "start_date": "2024-09-01",
-                        "end_date": "2024-09-19"
-                    }
-                }
-            })
-
-            content_text = res["result"]["content"][0]["text"]
-            result_data = json.loads(content_text)
-
-            # Check that we have both export and summary
-            assert "export" in result_data, "Response should contain 'export' field"
-            assert "summary" in result_data, "Response should contain 'summary' field"
-
-            summary_text = result_data["summary"]
-
-            # Check for expected keywords in summary
-            expected_keywords = [
-                "HMRC CSV Export Summary",
-                "Income:",
-                "Expenses:",
-                "Net:",
-                "Top 3 Expense Categories"
-            ]
-
-            for keyword in expected_keywords:
-                assert keyword in summary_text, f"Summary missing keyword: {keyword}"
-
-            print("✅ Summary keywords test passed")
-
-        finally:
-            os.chdir(original_cwd)
-
-
-def test_hmrc_categorization():
+    res, _ = hmrc_export_response
+
+    content_text = res["result"]["content"][0]["text"]
+    result_data = json.loads(content_text)
+
+    # Check that we have both export and summary
+    assert "export" in result_data, "Response should contain 'export' field"
+    assert "summary" in result_data, "Response should contain 'summary' field"
+
+    summary_text = result_data["summary"]
+
+    # Check for expected keywords in summary
+    expected_keywords = [
+        "HMRC CSV Export Summary",
+        "Income:",
+        "Expenses:",
+        "Net:",
+        "Top 3 Expense Categories"
+    ]
+
+    for keyword in expected_keywords:
+        assert keyword in summary_text, f"Summary missing keyword: {keyword}"
+
+    print("✅ Summary keywords test passed")
+
+
+def test_hmrc_categorization(hmrc_export_csv):
     """Test that transactions are properly categorized for HMRC."""
-    with tempfile.TemporaryDirectory() as temp_dir:
-        original_cwd = os.getcwd()
-        os.chdir(temp_dir)
-
-        try:
-            res = rpc({
-                "jsonrpc": "2.0",
-                "id": 5,
-                "method": "tools/call",
-                "params": {
-                    "name": "export_hmrc_csv",
-                    "arguments": {
-                        "account_id": "test123",
-                        "start_date": "2024-09-01",
-                        "end_date": "2024-09-19"
-                    }
-                }
-            })
-
-            # Find the CSV file
-            csv_files = [f for f in os.listdir(".") if f.endswith(".csv")]
-            csv_file = csv_files[0]
-
-            # Check categorization
-            with open(csv_file, 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                rows = list(reader)
-
-                # Check that categories are valid HMRC categories
-                from openbankingmcp.hmrc import get_valid_hmrc_categories
-                valid_categories = get_valid_hmrc_categories()
-
-                for row in rows:
-                    category = row["HMRC Category"]
-                    assert category in valid_categories, f"Invalid category: {category}"
-
-            print("✅ HMRC categorization test passed")
-
-        finally:
-            os.chdir(original_cwd)
-
-
-def test_export_schema_validation():
+    _, rows = hmrc_export_csv
+
+    # Check that categories are valid HMRC categories, reporting every offender
+    invalid_categories = {row["HMRC Category"] for row in rows} - VALID_HMRC_CATEGORIES
+    assert not invalid_categories, f"Invalid categories: {invalid_categories}"
+
+    print("✅ HMRC categorization test passed")
+
+
+def test_export_schema_validation(hmrc_export_response):
     """Test that export data conforms to Export schema."""
-    with tempfile.TemporaryDirectory() as temp_dir:
-        original_cwd = os.getcwd()
-        os.chdir(temp_dir)
-
-        try:
-            res = rpc({
-                "jsonrpc": "2.0",
-                "id": 6,
-                "method": "tools/call",
-                "params": {
-                    "name": "export_hmrc_csv",
-                    "arguments": {
-                        "account_id": "test123",
-                        "start_date": "2024-09-01",
-                        "end_date": "2024-09-19"
-                    }
-                }
-            })
-
-            content_text = res["result"]["content"][0]["text"]
-            result_data = json.loads(content_text)
-
-            # Check that we have both export and summary
-            assert "export" in result_data, "Response should contain 'export' field"
-            assert "summary" in result_data, "Response should contain 'summary' field"
-
-            export_data = result_data["export"]
-
-            # Validate export schema
-            assert "csv_path" in export_data, "Export should contain 'csv_path' field"
-            assert "metadata" in export_data, "Export should contain 'metadata' field"
-
-            csv_path = export_data["csv_path"]
-            metadata = export_data["metadata"]
-
-            # Validate csv_path
-            assert isinstance(csv_path, str), "CSV path should be a string"
-            assert csv_path.endswith('.csv'), "CSV path should end with .csv"
-
-            # Validate metadata
-            required_metadata_fields = ["account_id", "start_date", "end_date", "transaction_count", "created_at"]
-            for field in required_metadata_fields:
-                assert field in metadata, f"Metadata missing required field: {field}"
-
-            # Type validations
-            assert isinstance(metadata["transaction_count"], int), "Transaction count should be integer"
-            assert isinstance(metadata["created_at"], str), "Created at should be string"
-
-            # Value validations
-            assert metadata["account_id"] == "test123", "Account ID should match request"
-            assert metadata["start_date"] == "2024-09-01", "Start date should match request"
-            assert metadata["end_date"] == "2024-09-19", "End date should match request"
-            assert metadata["transaction_count"] >= 0, "Transaction count should be non-negative"
-
-            print("✅ Export schema validation passed")
-
-        finally:
-            os.chdir(original_cwd)
-
-
-if __name__ == "__main__":
-    print("🧪 Running export_hmrc_csv tests...\n")
-
-    try:
-        test_export_hmrc_csv_creates_file()
-        test_csv_has_correct_headers()
-        test_date_format_conversion()
-        test_summary_contains_keywords()
-        test_hmrc_categorization()
-        test_export_schema_validation()
-
-        print("\n🎉 All export_hmrc_csv tests passed!")
-        sys.exit(0)
-    except Exception as e:
-        print(f"\n💥 Test failed: {e}")
-        import traceback
-        traceback.print_exc()
-        sys.exit(1)
+    res, _ = hmrc_export_response
+
+    content_text = res["result"]["content"][0]["text"]
+    result_data = json.loads(content_text)
+
+    # Check that we have both export and summary
+    assert "export" in result_data, "Response should contain 'export' field"
+    assert "summary" in result_data, "Response should contain 'summary' field"
+
+    export_data = result_data["export"]
+
+    # Validate export schema
+    assert "csv_path" in export_data, "Export should contain 'csv_path' field"
+    assert "metadata" in export_data, "Export should contain 'metadata' field"
+
+    csv_path = export_data["csv_path"]
+    metadata = export_data["metadata"]
+
+    # Validate csv_path
+    assert isinstance(csv_path, str), "CSV path should be a string"
+    assert csv_path.endswith('.csv'), "CSV path should end with .csv"
+
+    # Validate metadata
+    required_metadata_fields = ["account_id", "start_date", "end_date", "transaction_count", "created_at"]
+    for field in required_metadata_fields:
+        assert field in metadata, f"Metadata missing required field: {field}"
+
+    # Type validations
+    assert isinstance(metadata["transaction_count"], int), "Transaction count should be integer"
+    assert isinstance(metadata["created_at"], str), "Created at should be string"
+
+    # Value validations
+    assert metadata["account_id"] == "test123", "Account ID should match request"
+    assert metadata["start_date"] == "2024-09-01", "Start date should match request"
+    assert metadata["end_date"] == "2024-09-19", "End date should match request"
+    assert metadata["transaction_count"] >= 0, "Transaction count should be non-negative"
+
+    print("✅ Export schema validation passed")
@@ -0,0 +1,118 @@
+"""
+Tests that the stdlib and pandas export pipelines produce the same HMRC CSV.
+"""
+import csv
+import io
+import pytest
+import openbankingmcp.server as server_module
+from openbankingmcp.server import MCPServer
+
+
+SAMPLE_TRANSACTIONS = [
+    {"date": "2024-09-15", "amount": -45.50, "currency": "GBP", "description": "TESCO STORES", "category": "groceries"},
+    {"date": "2024-09-14", "amount": -12.99, "currency": "GBP", "description": "", "merchant_name": "Uber"},
+    {"date": "2024-09-01", "amount": 2500.00, "currency": "GBP", "description": "SALARY PAYMENT"},
+    {"date": "not-a-date", "amount": -3.20, "description": "Wise fee"},
+    {"date": "", "amount": 0.0, "currency": "EUR", "description": "Zero value adjustment"},
+]
+
+
+def run_export(monkeypatch, tmp_path, min_rows):
+    """Export SAMPLE_TRANSACTIONS with the given pandas threshold."""
+    monkeypatch.setattr(server_module, "PANDAS_EXPORT_MIN_ROWS", min_rows)
+    server = MCPServer()
+    monkeypatch.setattr(server, "_get_transactions_data", lambda *args, **kwargs: list(SAMPLE_TRANSACTIONS))
+    monkeypatch.chdir(tmp_path)
+
+    result = server._export_hmrc_csv("acc1", "2024-09-01", "2024-09-30", f"export_{min_rows}.csv")
+    with open(tmp_path / f"export_{min_rows}.csv", newline="", encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    return result, rows
+
+
+def test_stdlib_export_totals(monkeypatch, tmp_path):
+    """Test CSV rows and totals from the row-by-row pipeline."""
+    result, rows = run_export(monkeypatch, tmp_path, min_rows=10**9)
+    metadata = result["export"]["metadata"]
+
+    assert metadata["transaction_count"] == 5
+    assert metadata["total_income"] == pytest.approx(2500.00)
+    assert metadata["total_expenses"] == pytest.approx(61.69)
+    assert [row["Date"] for row in rows] == ["15/09/2024", "14/09/2024", "01/09/2024", "not-a-date", ""]
+    assert rows[1]["Description"] == "Uber"
+    assert rows[1]["HMRC Category"] == "Travel"
+    assert rows[3]["Currency"] == "GBP"
+
+
+def test_pandas_export_matches_stdlib(monkeypatch, tmp_path):
+    """Test that the vectorized pipeline matches the row-by-row pipeline."""
+    pytest.importorskip("pandas")
+    monkeypatch.setattr(server_module, "PANDAS_AVAILABLE", True)
+
+    stdlib_result, stdlib_rows = run_export(monkeypatch, tmp_path, min_rows=10**9)
+    pandas_result, pandas_rows = run_export(monkeypatch, tmp_path, min_rows=0)
+
+    assert pandas_rows == stdlib_rows
+
+    stdlib_meta = stdlib_result["export"]["metadata"]
+    pandas_meta = pandas_result["export"]["metadata"]
+    for field in ("transaction_count", "total_income", "total_expenses", "net_total"):
+        assert pandas_meta[field] == pytest.approx(stdlib_meta[field])
+
+    # Summary differs only in the file name line
+    strip_file = lambda summary: [line for line in summary.splitlines() if not line.startswith("File:")]
+    assert strip_file(pandas_result["summary"]) == strip_file(stdlib_result["summary"])
+
+
+def test_writers_produce_identical_csv():
+    """Test that both writers emit byte-identical CSV, including amount formatting."""
+    pytest.importorskip("pandas")
+    transactions = SAMPLE_TRANSACTIONS + [
+        {"date": "2024-09-02", "amount": 12, "currency": "GBP", "description": "INTEREST, GROSS"},
+        {"date": "2024-09-03", "amount": -0.1, "currency": "GBP", "description": "TESCO STORES"},
+        {"date": "2024-09-04", "amount": -1234.5, "currency": "GBP", "description": "Quoted \"rent\""},
+    ]
+    server = MCPServer()
+    rows_csv, frame_csv = io.StringIO(), io.StringIO()
+
+    rows_totals = server._write_hmrc_csv_rows(transactions, rows_csv)
+    frame_totals = server._write_hmrc_csv_frame(transactions, frame_csv)
+
+    assert frame_csv.getvalue() == rows_csv.getvalue()
+    assert "\r\n02/09/2024,\"INTEREST, GROSS\",12.00,GBP," in rows_csv.getvalue()
+    assert frame_totals[:3] == pytest.approx(rows_totals[:3])
+    assert frame_totals[3] == pytest.approx(rows_totals[3])
+
+
+def test_export_builds_category_matcher_alongside_fetch(monkeypatch, tmp_path):
+    """Test that the keyword matcher is built lazily, once, during the export."""
+    server = MCPServer()
+    assert server._cat_automaton is None
+
+    built = []
+    real_build = server._build_category_automaton
+    monkeypatch.setattr(server, "_build_category_automaton", lambda: built.append(1) or real_build())
+    monkeypatch.setattr(server, "_get_transactions_data", lambda *args, **kwargs: list(SAMPLE_TRANSACTIONS))
+    pools = []
+    real_executor = server_module.ThreadPoolExecutor
+    monkeypatch.setattr(server_module, "ThreadPoolExecutor", lambda **kwargs: pools.append(1) or real_executor(**kwargs))
+    monkeypatch.chdir(tmp_path)
+
+    server._export_hmrc_csv("acc1", "2024-09-01", "2024-09-30", "lazy.csv")
+    server._export_hmrc_csv("acc1", "2024-09-01", "2024-09-30", "lazy.csv")
+
+    assert built == [1]
+    # Only the first export needs a helper thread
+    assert pools == [1]
+    assert server._cat_automaton is not None
+
+
+def test_sanitize_filename_keeps_absolute_directory_only_when_allowed(tmp_path):
+    """Test that only an existing absolute directory survives sanitization."""
+    server = MCPServer()
+    target = str(tmp_path / "out?.csv")
+
+    assert server._sanitize_filename(target, allow_directory=True) == str(tmp_path / "out_.csv")
+    assert "/" not in server._sanitize_filename(target)
+    assert "/" not in server._sanitize_filename(str(tmp_path / "missing" / "out"), allow_directory=True)
+    assert server._sanitize_filename("../out", allow_directory=True) == ".._out.csv"
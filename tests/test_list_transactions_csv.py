@@ -0,0 +1,183 @@
+"""
+Tests for list_transactions when a test.csv file is present.
+"""
+import builtins
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+import openbankingmcp.server as server_module
+from openbankingmcp.server import MCPServer
+
+
+SAMPLE_CSV = """Date,Description,Amount,Currency,HMRC Category
+15/09/2024,TESCO STORES,-45.50,GBP,General expenses
+1/9/2024,SALARY PAYMENT,2500.00,GBP,Income
+14/09/2024,Broken amount,abc,GBP,General expenses
+2024-09-13,Already ISO,-3.20,GBP,Bank charges
+31/02/2024,Impossible date,-1.00,GBP,General expenses
+12/09/2024,UBER TRIP,-12.99,GBP,Travel
+"""
+
+
+@pytest.fixture(params=["csv", "pandas"])
+def server(request, monkeypatch, tmp_path):
+    """Create MCP server reading test.csv via the stdlib or pandas loader."""
+    if request.param == "pandas":
+        pytest.importorskip("pandas")
+        monkeypatch.setattr(server_module, "PANDAS_AVAILABLE", True)
+    else:
+        monkeypatch.setattr(server_module, "PANDAS_AVAILABLE", False)
+
+    (tmp_path / "test.csv").write_text(SAMPLE_CSV, encoding="utf-8")
+    monkeypatch.chdir(tmp_path)
+    return MCPServer()
+
+
+def list_transactions(server, **overrides):
+    """Call _list_transactions with default arguments."""
+    args = {"account_id": "acc1", "start_date": "2024-09-01", "end_date": "2024-09-30", "limit": 10, "offset": 0}
+    args.update(overrides)
+    return server._list_transactions(args)
+
+
+def test_csv_rows_are_normalized(server):
+    """Test that valid CSV rows become schema-shaped transactions."""
+    transactions = list_transactions(server)["transactions"]
+
+    assert [t["id"] for t in transactions] == ["txn_001", "txn_002", "txn_004", "txn_006"]
+    assert transactions[0] == {
+        "id": "txn_001",
+        "date": "2024-09-15",
+        "description": "TESCO STORES",
+        "amount": -45.50,
+        "direction": "debit",
+        "account_id": "acc1",
+        "category": "General expenses"
+    }
+    assert transactions[1]["date"] == "2024-09-01"
+    assert transactions[1]["direction"] == "credit"
+    assert transactions[2]["date"] == "2024-09-13"
+
+
+def test_csv_pagination(server):
+    """Test that offset and limit select CSV rows before validation."""
+    result = list_transactions(server, limit=2, offset=2)
+
+    # Rows 3 and 4 are read; row 3 has an invalid amount and is dropped
+    assert [t["id"] for t in result["transactions"]] == ["txn_004"]
+    assert result["pagination"] == {
+        "total": 6,
+        "page": 2,
+        "limit": 2,
+        "offset": 2,
+        "has_more": True
+    }
+
+
+def test_csv_last_page(server):
+    """Test that the final page reports no more results."""
+    result = list_transactions(server, limit=4, offset=4)
+
+    assert [t["id"] for t in result["transactions"]] == ["txn_006"]
+    assert result["pagination"]["has_more"] is False
+
+    empty = list_transactions(server, limit=4, offset=8)
+    assert empty["transactions"] == []
+    assert empty["pagination"]["total"] == 6
+
+
+def test_csv_contents_are_cached_until_file_changes(server, monkeypatch, tmp_path):
+    """Test that test.csv is read once and re-read after it is modified."""
+    real_open = builtins.open
+    opened = []
+
+    def counting_open(file, *args, **kwargs):
+        if str(file).endswith("test.csv"):
+            opened.append(file)
+        return real_open(file, *args, **kwargs)
+
+    monkeypatch.setattr(builtins, "open", counting_open)
+
+    list_transactions(server)
+    list_transactions(server, offset=2)
+    assert len(opened) == 1
+
+    (tmp_path / "test.csv").write_text(
+        "Date,Description,Amount,Currency,HMRC Category\n01/10/2024,NEW ROW,-1.00,GBP,General expenses\n",
+        encoding="utf-8"
+    )
+    result = list_transactions(server)
+    assert len(opened) == 2
+    assert [t["description"] for t in result["transactions"]] == ["NEW ROW"]
+    assert result["pagination"]["total"] == 1
+
+
+def test_csv_missing_column_uses_default(server, tmp_path):
+    """Test that a file without the category column still loads."""
+    (tmp_path / "test.csv").write_text(
+        "Date,Description,Amount,Currency\n5/9/2024,CAFE,-2.50,GBP\n",
+        encoding="utf-8"
+    )
+    transactions = list_transactions(server)["transactions"]
+
+    assert len(transactions) == 1
+    assert transactions[0]["date"] == "2024-09-05"
+    assert transactions[0]["category"] == ""
+
+
+def test_concurrent_calls_while_csv_changes(server, tmp_path):
+    """Test that worker threads sharing the CSV caches never fail while test.csv is replaced."""
+    header = "Date,Description,Amount,Currency,HMRC Category\n"
+    versions = [header + "01/10/2024,ROW,-1.00,GBP,General expenses\n" * rows for rows in (1, 2, 3)]
+    (tmp_path / "test.csv").write_text(versions[0], encoding="utf-8")
+    stop = threading.Event()
+
+    def rewrite():
+        i = 0
+        while not stop.is_set():
+            staging = tmp_path / "test.csv.tmp"
+            staging.write_text(versions[i % len(versions)], encoding="utf-8")
+            os.replace(staging, tmp_path / "test.csv")
+            i += 1
+
+    writer = threading.Thread(target=rewrite)
+    writer.start()
+    try:
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(lambda _: list_transactions(server), range(200)))
+    finally:
+        stop.set()
+        writer.join()
+
+    totals = {result["pagination"]["total"] for result in results}
+    # A swallowed cache error would surface as an empty page with total 0
+    assert totals <= {1, 2, 3}
+    assert all(len(result["transactions"]) == result["pagination"]["total"] for result in results)
+
+
+IRREGULAR_CSV = (
+    "Date,Description,Amount,Currency,HMRC Category\n"
+    "01/09/2024,a,-1.00,GBP,General expenses\n"
+    "\n"
+    "02/09/2024,\"multi\nline\",-2.00,GBP,General expenses\n"
+    "03/09/2024,b,-3.00,GBP,General expenses\n"
+    "\n"
+    "04/09/2024,c,-4.00,GBP,General expenses\n"
+    "05/09/2024,d,-5.00,GBP,General expenses\n"
+).encode("utf-8")
+
+
+@pytest.mark.parametrize("offset,limit", [(0, 2), (1, 2), (2, 2), (3, 5), (4, 1), (5, 2)])
+def test_loaders_page_by_record(offset, limit):
+    """Test that both loaders page by record past blank lines and quoted newlines."""
+    pytest.importorskip("pandas")
+    server = MCPServer()
+
+    csv_page = server._load_csv_transactions(IRREGULAR_CSV, "acc1", offset, limit)
+    frame_page = server._load_csv_transactions_frame(IRREGULAR_CSV, "acc1", offset, limit)
+
+    assert frame_page == csv_page
+    descriptions = ["a", "multi\nline", "b", "c", "d"][offset:offset + limit]
+    assert [t["description"] for t in csv_page] == descriptions
+    assert server._count_csv_rows(("irregular", 0, 0), IRREGULAR_CSV) == 5
@@ -3,57 +3,44 @@
 Tests for PKCE and consent ledger functionality.
 """
 
+import io
 import json
-import subprocess
 import sys
 import os
+import threading
+import pytest
 
 # Add current directory to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+import openbankingmcp.server as server_module
+from tests.helpers import TOOLS_LIST_REQUEST, encode_request, rpc_pipeline, tool_call
 
-def rpc(req: dict) -> dict:
-    """Send RPC request to server and return response."""
-    p = subprocess.run(
-        [sys.executable, "-m", "openbankingmcp.server"],
-        input=json.dumps(req).encode(),
-        capture_output=True,
-        check=True
-    )
-    line = p.stdout.decode().splitlines()[0]
-    return json.loads(line)
+STATE_MISMATCH_REQUEST = tool_call("complete_code_exchange", {
+    "code": "test_code",
+    "state": "invalid_state"
+})
 
 
-def test_list_consents_returns_content():
+@pytest.fixture(scope="module")
+def responses(server_proc):
+    """Every request this module makes, pipelined to the shared server in one write."""
+    names = ("list_consents", "state_mismatch", "create_auth_link", "tools_list")
+    reqs = [tool_call("list_consents", {}), STATE_MISMATCH_REQUEST, tool_call("create_data_auth_link", {}), TOOLS_LIST_REQUEST]
+    return dict(zip(names, rpc_pipeline(server_proc, reqs)))
+
+
+def test_list_consents_returns_content(responses):
     """Test that list_consents returns proper content format."""
-    res = rpc({
-        "jsonrpc": "2.0",
-        "id": 1,
-        "method": "tools/call",
-        "params": {
-            "name": "list_consents",
-            "arguments": {}
-        }
-    })
+    res = responses["list_consents"]
     content = res["result"]["content"]
     assert isinstance(content, list) and content and content[0]["type"] == "text"
     print("✅ list_consents returns content")
 
 
-def test_complete_code_exchange_state_mismatch():
+def test_complete_code_exchange_state_mismatch(responses):
     """Test that complete_code_exchange returns error for invalid state."""
-    res = rpc({
-        "jsonrpc": "2.0",
-        "id": 2,
-        "method": "tools/call",
-        "params": {
-            "name": "complete_code_exchange",
-            "arguments": {
-                "code": "test_code",
-                "state": "invalid_state"
-            }
-        }
-    })
+    res = responses["state_mismatch"]
 
     # Should return error content for invalid state
     content = res["result"]["content"][0]["text"]
@@ -64,17 +51,9 @@ def test_complete_code_exchange_state_mismatch():
     print("✅ complete_code_exchange handles state mismatch")
 
 
-def test_create_auth_link_includes_pkce():
+def test_create_auth_link_includes_pkce(responses):
     """Test that create_data_auth_link includes PKCE parameters."""
-    res = rpc({
-        "jsonrpc": "2.0",
-        "id": 3,
-        "method": "tools/call",
-        "params": {
-            "name": "create_data_auth_link",
-            "arguments": {}
-        }
-    })
+    res = responses["create_auth_link"]
 
     content = res["result"]["content"][0]["text"]
     result_data = json.loads(content)
@@ -90,14 +69,9 @@ def test_create_auth_link_includes_pkce():
         print("✅ create_data_auth_link returns mock URL (no credentials)")
 
 
-def test_tools_list_includes_new_tools():
+def test_tools_list_includes_new_tools(responses):
     """Test that tools/list includes the new PKCE and consent tools."""
-    res = rpc({
-        "jsonrpc": "2.0",
-        "id": 4,
-        "method": "tools/list",
-        "params": {}
-    })
+    res = responses["tools_list"]
 
     tools = res["result"]["tools"]
     tool_names = [tool["name"] for tool in tools]
@@ -112,19 +86,42 @@ def test_tools_list_includes_new_tools():
     print("✅ Tools list includes new PKCE and consent tools")
 
 
-if __name__ == "__main__":
-    print("🧪 Running PKCE and consent tests...\n")
-
-    try:
-        test_list_consents_returns_content()
-        test_complete_code_exchange_state_mismatch()
-        test_create_auth_link_includes_pkce()
-        test_tools_list_includes_new_tools()
-
-        print("\n🎉 All PKCE and consent tests passed!")
-        sys.exit(0)
-    except Exception as e:
-        print(f"\n💥 Test failed: {e}")
-        import traceback
-        traceback.print_exc()
-        sys.exit(1)
+def test_auth_tools_are_not_reordered_by_dispatch(monkeypatch, capsys):
+    """Test that a pipelined call after complete_code_exchange only starts once it has finished."""
+    events = []
+    events_lock = threading.Lock()
+    # list_consents stays in flight until the dispatcher has seen the auth call,
+    # so the barrier always has an unfinished request to wait for
+    barrier_reached = threading.Event()
+    is_stateful_request = server_module._is_stateful_request
+
+    def recording_is_stateful_request(request):
+        stateful = is_stateful_request(request)
+        if stateful:
+            barrier_reached.set()
+        return stateful
+
+    def recording_handle_request(self, request):
+        name = request["params"]["name"]
+        with events_lock:
+            events.append(("start", name))
+        if name == "list_consents":
+            barrier_reached.wait(timeout=10)
+        with events_lock:
+            events.append(("end", name))
+
+    monkeypatch.setattr(server_module, "_is_stateful_request", recording_is_stateful_request)
+    monkeypatch.setattr(server_module.MCPServer, "handle_request", recording_handle_request)
+    lines = [tool_call(name, {}, request_id=i) for i, name in enumerate(
+        ["list_consents", "complete_code_exchange", "get_accounts"]
+    )]
+    monkeypatch.setattr(sys, "stdin", io.StringIO("".join(encode_request(req).decode() for req in lines)))
+
+    server_module.run_mcp_server()
+
+    assert barrier_reached.is_set()
+    assert events == [
+        ("start", "list_consents"), ("end", "list_consents"),
+        ("start", "complete_code_exchange"), ("end", "complete_code_exchange"),
+        ("start", "get_accounts"), ("end", "get_accounts"),
+    ]
@@ -3,16 +3,55 @@
 Tests for the retention enforcer functionality.
 """
 
+import inspect
 import os
+import pathlib
 import sys
 import tempfile
 import time
 from datetime import datetime, timedelta
+from unittest import mock
 
 # Add current directory to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from scripts.retention import RetentionEnforcer
 
+TWO_DAYS = 2 * 24 * 60 * 60
+CSV_PAYLOAD = b"test,data\n1,2\n"
+OLD_CSV_FILES = ("old1.csv", "old2.csv")
+RECENT_CSV_FILES = ("recent.csv",)
+
+
+def make_csv_dir(directory, names=(), payload=CSV_PAYLOAD, aged=(), age_days=2):
+    """
+    Write the named files (which may include subdirectories) into directory, backdating those in aged.
+
+    The directory is opened once and every file is created, written and
+    backdated relative to that handle, with no per-file path lookup from the root.
+    """
+    old_time = time.time() - age_days * 24 * 60 * 60
+    dir_fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        for name in names:
+            parts = name.split("/")[:-1]
+            for depth in range(1, len(parts) + 1):
+                try:
+                    os.mkdir("/".join(parts[:depth]), dir_fd=dir_fd)
+                except FileExistsError:
+                    pass
+
+            fd = os.open(name, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644, dir_fd=dir_fd)
+            try:
+                # One gathered raw write per file, no Python-level buffering
+                os.writev(fd, [payload])
+            finally:
+                os.close(fd)
+            if name in aged:
+                os.utime(name, (old_time, old_time), dir_fd=dir_fd)
+    finally:
+        os.close(dir_fd)
+    return str(directory)
+
 
 def test_retention_enforcer_initialization():
     """Test that RetentionEnforcer initializes correctly."""
@@ -25,255 +64,326 @@ def test_retention_enforcer_initialization():
     print("✅ RetentionEnforcer initialization test passed")
 
 
-def test_file_age_calculation():
+def test_file_age_calculation(tmp_path):
     """Test file age calculation functionality."""
-    with tempfile.TemporaryDirectory() as temp_dir:
-        # Create a test file
-        test_file = os.path.join(temp_dir, "test.txt")
-        with open(test_file, 'w') as f:
-            f.write("test content")
+    # Create a test file
+    temp_dir = make_csv_dir(tmp_path, ["test.txt"])
+    test_file = os.path.join(temp_dir, "test.txt")
 
-        enforcer = RetentionEnforcer(temp_dir, 30)
-        file_age = enforcer.get_file_age(test_file)
+    enforcer = RetentionEnforcer(temp_dir, 30)
+    file_age = enforcer.get_file_age(test_file)
 
-        # File age should be recent (within last few seconds)
-        now = datetime.now()
-        time_diff = (now - file_age).total_seconds()
-        assert time_diff < 10, f"File age calculation seems incorrect: {time_diff} seconds"
+    # File age should be recent (within last few seconds)
+    now = datetime.now()
+    time_diff = (now - file_age).total_seconds()
+    assert time_diff < 10, f"File age calculation seems incorrect: {time_diff} seconds"
 
-        print("✅ File age calculation test passed")
+    print("✅ File age calculation test passed")
 
 
-def test_file_old_detection():
+def test_file_old_detection(tmp_path):
     """Test detection of old files."""
-    with tempfile.TemporaryDirectory() as temp_dir:
-        enforcer = RetentionEnforcer(temp_dir, 1)  # 1 day retention
+    # Create a recent file, and an old file backdated to 2 days ago
+    temp_dir = make_csv_dir(tmp_path, ["recent.txt", "old.txt"], aged={"old.txt"})
+    enforcer = RetentionEnforcer(temp_dir, 1)  # 1 day retention
+    recent_file = os.path.join(temp_dir, "recent.txt")
+    old_file = os.path.join(temp_dir, "old.txt")
+
+    # Test old file detection
+    assert not enforcer.is_file_old(recent_file), "Recent file should not be considered old"
+    assert enforcer.is_file_old(old_file), "Old file should be considered old"
+    # A file that can't be stat'ed has no age, so it counts as old
+    assert enforcer.is_file_old(os.path.join(temp_dir, "missing.txt")), "Missing file should be considered old"
+
+    print("✅ File old detection test passed")
+
 
-        # Create a recent file
-        recent_file = os.path.join(temp_dir, "recent.txt")
-        with open(recent_file, 'w') as f:
-            f.write("recent content")
+def test_analysis_reuses_scandir_entries(tmp_path):
+    """Test that analysis takes sizes and times from the scandir entries."""
+    temp_dir = make_csv_dir(tmp_path, ["a.csv", "b.csv"])
 
-        # Create an old file by manipulating its timestamp
-        old_file = os.path.join(temp_dir, "old.txt")
-        with open(old_file, 'w') as f:
-            f.write("old content")
+    with mock.patch("os.stat", wraps=os.stat) as stat:
+        analysis = RetentionEnforcer(temp_dir, 30).analyze_csv_files()
 
-        # Set the old file's modification time to 2 days ago
-        old_time = time.time() - (2 * 24 * 60 * 60)  # 2 days ago
-        os.utime(old_file, (old_time, old_time))
+    assert analysis["total_files"] == 2
+    assert stat.call_count == 0, f"Expected no path-based stat calls, got {stat.call_args_list}"
+    assert all(info["size_bytes"] == len(CSV_PAYLOAD) for info in analysis["recent_files"])
 
-        # Test old file detection
-        assert not enforcer.is_file_old(recent_file), "Recent file should not be considered old"
-        assert enforcer.is_file_old(old_file), "Old file should be considered old"
+    print("✅ Scandir entry reuse test passed")
 
-        print("✅ File old detection test passed")
 
+def test_directory_mtime_prefilter(tmp_path):
+    """Test that only a non-conservative sweep trusts an aged directory's mtime."""
+    # rewritten.csv was rewritten in place: the file is recent but its directory
+    # stays aged. The recently touched top level is still checked file by file.
+    temp_dir = make_csv_dir(
+        tmp_path,
+        ["2024-08/old.csv", "2024-08/rewritten.csv", "top_old.csv", "top_recent.csv"],
+        aged={"2024-08/old.csv", "top_old.csv"}
+    )
+    old_time = time.time() - TWO_DAYS
+    os.utime(os.path.join(temp_dir, "2024-08"), (old_time, old_time))
 
-def test_csv_file_discovery():
+    def old_names(conservative):
+        enforcer = RetentionEnforcer(temp_dir, 1, recursive=True, conservative=conservative)
+        return sorted(info["filename"] for info in enforcer.analyze_csv_files()["old_files"])
+
+    assert old_names(conservative=True) == ["old.csv", "top_old.csv"]
+    assert old_names(conservative=False) == ["old.csv", "rewritten.csv", "top_old.csv"]
+
+    # Sizes in the aged directory were never read, and say so
+    enforcer = RetentionEnforcer(temp_dir, 1, recursive=True, conservative=False)
+    report = enforcer.generate_report()
+    assert "- old.csv (size unknown, modified:" in report
+    assert f"- top_old.csv ({len(CSV_PAYLOAD)} bytes, modified:" in report
+
+    results = enforcer.cleanup_old_files(dry_run=False)
+    assert results["files_deleted"] == 3
+    assert results["files_size_unknown"] == 2
+    assert results["total_size_freed_bytes"] == len(CSV_PAYLOAD)
+
+    print("✅ Directory mtime prefilter test passed")
+
+
+def test_csv_file_discovery(tmp_path):
     """Test CSV file discovery functionality."""
-    with tempfile.TemporaryDirectory() as temp_dir:
-        # Create various CSV files
-        csv_files = [
-            "normal.csv",
-            "hmrc_export_123_2024-09-01_2024-09-30.csv",
-            "test_export.csv",
-            "data.csv"
-        ]
+    # Create various CSV files, and a non-CSV file
+    csv_files = [
+        "normal.csv",
+        "hmrc_export_123_2024-09-01_2024-09-30.csv",
+        "test_export.csv",
+        "data.csv"
+    ]
+    temp_dir = make_csv_dir(tmp_path, csv_files + ["not_csv.txt"])
 
-        for csv_file in csv_files:
-            file_path = os.path.join(temp_dir, csv_file)
-            with open(file_path, 'w') as f:
-                f.write("test,data\n1,2\n")
+    enforcer = RetentionEnforcer(temp_dir, 30)
+    found_files = enforcer.find_csv_files()
 
-        # Create a non-CSV file
-        non_csv = os.path.join(temp_dir, "not_csv.txt")
-        with open(non_csv, 'w') as f:
-            f.write("not csv content")
+    # Should find all CSV files but not the text file
+    assert len(found_files) >= len(csv_files), f"Expected at least {len(csv_files)} CSV files, found {len(found_files)}"
 
-        enforcer = RetentionEnforcer(temp_dir, 30)
-        found_files = enforcer.find_csv_files()
+    # Check that all expected CSV files are found
+    found_basenames = [os.path.basename(f) for f in found_files]
+    for csv_file in csv_files:
+        assert csv_file in found_basenames, f"CSV file {csv_file} not found in results"
 
-        # Should find all CSV files but not the text file
-        assert len(found_files) >= len(csv_files), f"Expected at least {len(csv_files)} CSV files, found {len(found_files)}"
+    print("✅ CSV file discovery test passed")
 
-        # Check that all expected CSV files are found
-        found_basenames = [os.path.basename(f) for f in found_files]
-        for csv_file in csv_files:
-            assert csv_file in found_basenames, f"CSV file {csv_file} not found in results"
 
-        print("✅ CSV file discovery test passed")
+def test_csv_file_discovery_subdirectories(tmp_path):
+    """Test that subdirectories are searched only when recursive is set."""
+    temp_dir = make_csv_dir(tmp_path, ["test_top.csv", "exports/2024/nested.csv", ".hidden.csv"])
+    nested_dir = os.path.join(temp_dir, "exports", "2024")
 
+    flat = RetentionEnforcer(temp_dir, 30).find_csv_files()
+    recursive = RetentionEnforcer(temp_dir, 30, recursive=True).find_csv_files()
 
-def test_analysis_functionality():
-    """Test file analysis functionality."""
-    with tempfile.TemporaryDirectory() as temp_dir:
-        enforcer = RetentionEnforcer(temp_dir, 1)  # 1 day retention
+    # Each file is listed once, and hidden files are skipped
+    assert [os.path.basename(f) for f in flat] == ["test_top.csv"]
+    assert sorted(os.path.basename(f) for f in recursive) == ["nested.csv", "test_top.csv"]
+    assert os.path.join(nested_dir, "nested.csv") in recursive
 
-        # Create recent and old files
-        recent_file = os.path.join(temp_dir, "recent.csv")
-        with open(recent_file, 'w') as f:
-            f.write("recent,data\n1,2\n")
+    print("✅ Recursive CSV file discovery test passed")
 
-        old_file = os.path.join(temp_dir, "old.csv")
-        with open(old_file, 'w') as f:
-            f.write("old,data\n3,4\n")
 
-        # Set old file timestamp
-        old_time = time.time() - (2 * 24 * 60 * 60)  # 2 days ago
-        os.utime(old_file, (old_time, old_time))
+def test_csv_file_discovery_wide_tree(tmp_path):
+    """Test that a wide tree scanned on the thread pool finds every CSV once."""
+    names = []
+    for month in range(1, 13):
+        names += [f"2024-{month:02d}/hmrc_export.csv", f"2024-{month:02d}/daily/summary.csv"]
+    temp_dir = make_csv_dir(tmp_path, names)
+    expected = [os.path.join(temp_dir, *name.split("/")) for name in names]
 
-        analysis = enforcer.analyze_csv_files()
+    flat = RetentionEnforcer(temp_dir, 30).find_csv_files()
+    recursive = RetentionEnforcer(temp_dir, 30, recursive=True).find_csv_files()
 
-        # Validate analysis structure
-        required_keys = ["total_files", "old_files", "recent_files", "retention_threshold", "retention_days"]
-        for key in required_keys:
-            assert key in analysis, f"Analysis missing key: {key}"
+    assert flat == []
+    assert sorted(recursive) == sorted(expected)
 
-        assert analysis["total_files"] == 2, f"Expected 2 total files, got {analysis['total_files']}"
-        assert len(analysis["old_files"]) == 1, f"Expected 1 old file, got {len(analysis['old_files'])}"
-        assert len(analysis["recent_files"]) == 1, f"Expected 1 recent file, got {len(analysis['recent_files'])}"
+    print("✅ Wide tree CSV file discovery test passed")
 
-        # Validate file info structure
-        old_file_info = analysis["old_files"][0]
-        required_file_keys = ["path", "filename", "size_bytes", "modified_time", "is_old"]
-        for key in required_file_keys:
-            assert key in old_file_info, f"File info missing key: {key}"
 
-        assert old_file_info["is_old"] is True, "Old file should be marked as old"
+def test_analysis_functionality(tmp_path):
+    """Test file analysis functionality."""
+    # Create recent and old files
+    temp_dir = make_csv_dir(tmp_path, ["recent.csv", "old.csv"], aged={"old.csv"})
+    enforcer = RetentionEnforcer(temp_dir, 1)  # 1 day retention
 
-        print("✅ Analysis functionality test passed")
+    analysis = enforcer.analyze_csv_files()
 
+    # Validate analysis structure
+    required_keys = ["total_files", "old_files", "recent_files", "retention_threshold", "retention_days"]
+    for key in required_keys:
+        assert key in analysis, f"Analysis missing key: {key}"
 
-def test_cleanup_dry_run():
-    """Test cleanup functionality in dry-run mode."""
-    with tempfile.TemporaryDirectory() as temp_dir:
-        enforcer = RetentionEnforcer(temp_dir, 1)  # 1 day retention
+    assert analysis["total_files"] == 2, f"Expected 2 total files, got {analysis['total_files']}"
+    assert len(analysis["old_files"]) == 1, f"Expected 1 old file, got {len(analysis['old_files'])}"
+    assert len(analysis["recent_files"]) == 1, f"Expected 1 recent file, got {len(analysis['recent_files'])}"
 
-        # Create old files
-        old_files = ["old1.csv", "old2.csv"]
-        for old_file in old_files:
-            file_path = os.path.join(temp_dir, old_file)
-            with open(file_path, 'w') as f:
-                f.write("old,data\n1,2\n")
+    # Validate file info structure
+    old_file_info = analysis["old_files"][0]
+    required_file_keys = ["path", "filename", "size_bytes", "modified_time", "is_old"]
+    for key in required_file_keys:
+        assert key in old_file_info, f"File info missing key: {key}"
 
-            # Set old timestamp
-            old_time = time.time() - (2 * 24 * 60 * 60)  # 2 days ago
-            os.utime(file_path, (old_time, old_time))
+    assert old_file_info["is_old"] is True, "Old file should be marked as old"
 
-        # Run dry-run cleanup
-        results = enforcer.cleanup_old_files(dry_run=True)
+    print("✅ Analysis functionality test passed")
 
-        # Validate results structure
-        required_keys = ["dry_run", "files_processed", "files_deleted", "errors", "deleted_files", "total_size_freed_bytes"]
-        for key in required_keys:
-            assert key in results, f"Results missing key: {key}"
 
-        assert results["dry_run"] is True, "Should be in dry-run mode"
-        assert results["files_processed"] == 2, f"Expected 2 files processed, got {results['files_processed']}"
-        assert results["files_deleted"] == 2, f"Expected 2 files would be deleted, got {results['files_deleted']}"
+def test_cleanup_dry_run_then_deletion(tmp_path):
+    """Test a dry-run cleanup, then actual deletion, against the same files."""
+    temp_dir = make_csv_dir(tmp_path, OLD_CSV_FILES + RECENT_CSV_FILES, aged=OLD_CSV_FILES)
+    enforcer = RetentionEnforcer(temp_dir, 1)  # 1 day retention
+    old_paths = [os.path.join(temp_dir, name) for name in OLD_CSV_FILES]
+    recent_paths = [os.path.join(temp_dir, name) for name in RECENT_CSV_FILES]
 
-        # Files should still exist in dry-run mode
-        for old_file in old_files:
-            file_path = os.path.join(temp_dir, old_file)
-            assert os.path.exists(file_path), f"File {old_file} should still exist after dry-run"
+    # Dry run first; it must leave the directory untouched for the second phase
+    results = enforcer.cleanup_old_files(dry_run=True)
 
-        print("✅ Cleanup dry-run test passed")
+    # Validate results structure
+    required_keys = ["dry_run", "files_processed", "files_deleted", "errors", "deleted_files", "total_size_freed_bytes"]
+    for key in required_keys:
+        assert key in results, f"Results missing key: {key}"
 
+    assert results["dry_run"] is True, "Should be in dry-run mode"
+    assert results["files_processed"] == 2, f"Expected 2 files processed, got {results['files_processed']}"
+    assert results["files_deleted"] == 2, f"Expected 2 files would be deleted, got {results['files_deleted']}"
 
-def test_cleanup_actual_deletion():
-    """Test actual file deletion functionality."""
-    with tempfile.TemporaryDirectory() as temp_dir:
-        enforcer = RetentionEnforcer(temp_dir, 1)  # 1 day retention
+    # Files should still exist in dry-run mode
+    for file_path in old_paths:
+        assert os.path.exists(file_path), f"File {file_path} should still exist after dry-run"
 
-        # Create old files
-        old_files = ["old1.csv", "old2.csv"]
-        for old_file in old_files:
-            file_path = os.path.join(temp_dir, old_file)
-            with open(file_path, 'w') as f:
-                f.write("old,data\n1,2\n")
+    print("✅ Cleanup dry-run phase passed")
 
-            # Set old timestamp
-            old_time = time.time() - (2 * 24 * 60 * 60)  # 2 days ago
-            os.utime(file_path, (old_time, old_time))
+    # Run actual cleanup
+    results = enforcer.cleanup_old_files(dry_run=False)
 
-        # Create a recent file that should not be deleted
-        recent_file = os.path.join(temp_dir, "recent.csv")
-        with open(recent_file, 'w') as f:
-            f.write("recent,data\n1,2\n")
+    assert results["dry_run"] is False, "Should not be in dry-run mode"
+    assert results["files_processed"] == 2, f"Expected 2 files processed, got {results['files_processed']}"
+    assert results["files_deleted"] == 2, f"Expected 2 files deleted, got {results['files_deleted']}"
 
-        # Run actual cleanup
-        results = enforcer.cleanup_old_files(dry_run=False)
+    # Old files should be deleted
+    for file_path in old_paths:
+        assert not os.path.exists(file_path), f"File {file_path} should be deleted"
+
+    # Recent file should still exist
+    for file_path in recent_paths:
+        assert os.path.exists(file_path), "Recent file should not be deleted"
 
-        assert results["dry_run"] is False, "Should not be in dry-run mode"
-        assert results["files_processed"] == 2, f"Expected 2 files processed, got {results['files_processed']}"
-        assert results["files_deleted"] == 2, f"Expected 2 files deleted, got {results['files_deleted']}"
+    print("✅ Cleanup actual deletion phase passed")
 
-        # Old files should be deleted
-        for old_file in old_files:
-            file_path = os.path.join(temp_dir, old_file)
-            assert not os.path.exists(file_path), f"File {old_file} should be deleted"
 
-        # Recent file should still exist
-        assert os.path.exists(recent_file), "Recent file should not be deleted"
+def test_cleanup_deletes_relative_to_directory_handle(tmp_path):
+    """Test that cleanup unlinks by name against one handle per directory."""
+    names = ["old1.csv", "old2.csv", "nested/old1.csv", "nested/old2.csv"]
+    temp_dir = make_csv_dir(tmp_path, names, aged=names)
+    nested_dir = os.path.join(temp_dir, "nested")
+    enforcer = RetentionEnforcer(temp_dir, 1, recursive=True)
 
-        print("✅ Cleanup actual deletion test passed")
+    with mock.patch("os.unlink", wraps=os.unlink) as unlink:
+        results = enforcer.cleanup_old_files(dry_run=False)
+
+    assert results["files_deleted"] == 4 and not results["errors"]
+    assert os.listdir(temp_dir) == ["nested"] and os.listdir(nested_dir) == []
+    if os.unlink in os.supports_dir_fd:
+        assert sorted(call.args[0] for call in unlink.call_args_list) == ["old1.csv", "old1.csv", "old2.csv", "old2.csv"]
+        assert len({call.kwargs["dir_fd"] for call in unlink.call_args_list}) == 2
+
+    print("✅ Cleanup directory handle test passed")
 
 
-def test_deletion_test_functionality():
+def test_deletion_test_functionality(tmp_path):
     """Test the deletion test functionality."""
-    with tempfile.TemporaryDirectory() as temp_dir:
-        enforcer = RetentionEnforcer(temp_dir, 30)
+    temp_dir = str(tmp_path)
+    enforcer = RetentionEnforcer(temp_dir, 30)
 
-        # Run deletion test
-        success = enforcer.test_deletion()
+    # Run deletion test
+    success = enforcer.test_deletion()
 
-        assert success is True, "Deletion test should succeed"
+    assert success is True, "Deletion test should succeed"
 
-        # Ensure test file was cleaned up
-        test_file = os.path.join(temp_dir, "retention_test_file.tmp")
-        assert not os.path.exists(test_file), "Test file should be cleaned up"
+    # Ensure test file was cleaned up
+    test_file = os.path.join(temp_dir, "retention_test_file.tmp")
+    assert not os.path.exists(test_file), "Test file should be cleaned up"
 
-        print("✅ Deletion test functionality passed")
+    print("✅ Deletion test functionality passed")
 
 
-def test_report_generation():
+def test_report_generation(tmp_path):
     """Test report generation functionality."""
-    with tempfile.TemporaryDirectory() as temp_dir:
-        enforcer = RetentionEnforcer(temp_dir, 7)  # 7 day retention
+    # Create some test files
+    temp_dir = make_csv_dir(tmp_path, ["file1.csv", "file2.csv"])
+    enforcer = RetentionEnforcer(temp_dir, 7)  # 7 day retention
 
-        # Create some test files
-        test_files = ["file1.csv", "file2.csv"]
-        for test_file in test_files:
-            file_path = os.path.join(temp_dir, test_file)
-            with open(file_path, 'w') as f:
-                f.write("test,data\n1,2\n")
+    report = enforcer.generate_report()
 
-        report = enforcer.generate_report()
+    # Validate report content
+    assert "CSV File Retention Report" in report
+    assert "Base Directory:" in report
+    assert "Retention Period: 7 days" in report
+    assert "Total CSV files found:" in report
+    assert "file1.csv" in report or "file2.csv" in report
 
-        # Validate report content
-        assert "CSV File Retention Report" in report
-        assert "Base Directory:" in report
-        assert "Retention Period: 7 days" in report
-        assert "Total CSV files found:" in report
-        assert "file1.csv" in report or "file2.csv" in report
+    print("✅ Report generation test passed")
 
-        print("✅ Report generation test passed")
+
+def test_report_reuses_recent_analysis(tmp_path):
+    """Test that a report right after an analysis does not walk the tree again."""
+    temp_dir = make_csv_dir(tmp_path, ["file1.csv"])
+    enforcer = RetentionEnforcer(temp_dir, 7)
+    enforcer.analyze_csv_files()
+
+    with mock.patch("os.scandir", wraps=os.scandir) as scandir:
+        enforcer.generate_report()
+        assert scandir.call_count == 0, "Report should reuse the cached analysis"
+
+        enforcer.invalidate_cache()
+        enforcer.generate_report()
+        assert scandir.call_count == 1, "Report should rescan after invalidate_cache"
+
+        enforcer.cache_ttl_seconds = 0
+        enforcer.generate_report()
+        assert scandir.call_count == 2, "Report should rescan once the cache has expired"
+
+    # Deleting files invalidates the cached analysis
+    enforcer.cache_ttl_seconds = 60
+    enforcer.cleanup_old_files(dry_run=False)
+    assert enforcer._analysis_cache is None
+
+    print("✅ Report analysis cache test passed")
+
+
+def _run_test(test):
+    """Run one test outside pytest, giving it a fresh tmp_path if it asks for one."""
+    if "tmp_path" not in inspect.signature(test).parameters:
+        test()
+        return
+    with tempfile.TemporaryDirectory() as temp_dir:
+        test(pathlib.Path(temp_dir))
 
 
 if __name__ == "__main__":
     print("🧪 Running retention enforcer tests...\n")
 
     try:
-        test_retention_enforcer_initialization()
-        test_file_age_calculation()
-        test_file_old_detection()
-        test_csv_file_discovery()
-        test_analysis_functionality()
-        test_cleanup_dry_run()
-        test_cleanup_actual_deletion()
-        test_deletion_test_functionality()
-        test_report_generation()
+        for test in (
+            test_retention_enforcer_initialization,
+            test_file_age_calculation,
+            test_file_old_detection,
+            test_csv_file_discovery,
+            test_csv_file_discovery_subdirectories,
+            test_csv_file_discovery_wide_tree,
+            test_analysis_functionality,
+            test_analysis_reuses_scandir_entries,
+            test_directory_mtime_prefilter,
+            test_cleanup_dry_run_then_deletion,
+            test_cleanup_deletes_relative_to_directory_handle,
+            test_deletion_test_functionality,
+            test_report_generation,
+            test_report_reuses_recent_analysis,
+        ):
+            _run_test(test)
 
         print("\n🎉 All retention enforcer tests passed!")
         sys.exit(0)
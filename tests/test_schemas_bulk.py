@@ -0,0 +1,57 @@
+"""
+Tests for the whole-list schema validators.
+"""
+import pytest
+import openbankingmcp.schemas as schemas
+from openbankingmcp.schemas import validate_accounts, validate_transactions
+
+
+VALID_TRANSACTIONS = [
+    {"id": "txn_001", "date": "2024-09-15", "description": "TESCO", "amount": -45.5,
+     "direction": "debit", "account_id": "acc1", "category": "General expenses"},
+    {"id": "txn_002", "date": "2024-09-01", "description": "SALARY", "amount": 2500,
+     "direction": "credit", "account_id": "acc1"},
+]
+
+
+@pytest.fixture(params=["pydantic", "loop"])
+def bulk_mode(request, monkeypatch):
+    """Run each test with and without the pydantic fast path."""
+    if request.param == "pydantic":
+        if not schemas.PYDANTIC_AVAILABLE:
+            pytest.skip("pydantic v2 not installed")
+    else:
+        monkeypatch.setattr(schemas, "_ACCOUNT_LIST_ADAPTER", None)
+        monkeypatch.setattr(schemas, "_TRANSACTION_LIST_ADAPTER", None)
+    return request.param
+
+
+def test_valid_transactions_are_returned_unchanged(bulk_mode):
+    """Test that a valid list is returned as the same objects."""
+    result = validate_transactions(VALID_TRANSACTIONS)
+
+    assert result is VALID_TRANSACTIONS
+    assert result[0] is VALID_TRANSACTIONS[0]
+
+
+@pytest.mark.parametrize("field,value,message", [
+    ("direction", "sideways", "direction must be 'credit' or 'debit'"),
+    ("amount", "12.00", "amount must be a number"),
+    ("date", "2024-02-31", "YYYY-MM-DD"),
+])
+def test_invalid_transaction_reports_index(bulk_mode, field, value, message):
+    """Test that errors name the offending row, whichever path ran."""
+    transactions = [dict(txn) for txn in VALID_TRANSACTIONS]
+    transactions[1][field] = value
+
+    with pytest.raises(ValueError, match=r"transactions\[1\]") as excinfo:
+        validate_transactions(transactions)
+    assert message in str(excinfo.value)
+
+
+def test_unknown_currency_still_warns(bulk_mode, capsys):
+    """Test that accounts outside the fast path keep the per-row warning."""
+    accounts = [{"id": "a1", "name": "Main", "type": "checking", "currency": "JPY", "balance": 1.0}]
+
+    assert validate_accounts(accounts) is accounts
+    assert "Unknown currency JPY" in capsys.readouterr().out
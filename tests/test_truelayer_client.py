@@ -0,0 +1,235 @@
+"""
+Tests for the TrueLayer HTTP client plumbing on MCPServer.
+"""
+import httpx
+import pytest
+import requests
+import openbankingmcp.server as server_module
+from openbankingmcp.server import MCPServer, TRUELAYER_TIMEOUT
+
+
+class FakeResponse:
+    """Minimal stand-in for requests.Response."""
+
+    def __init__(self, payload, status_code=200):
+        self._payload = payload
+        self.status_code = status_code
+        self.text = str(payload)
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.exceptions.HTTPError(f"{self.status_code} error")
+
+    def json(self):
+        return self._payload
+
+
+class FakeSession:
+    """Records calls made through MCPServer.http."""
+
+    def __init__(self, payload):
+        self.payload = payload
+        self.calls = []
+
+    def get(self, url, **kwargs):
+        self.calls.append(("GET", url, kwargs))
+        return FakeResponse(self.payload)
+
+    def post(self, url, **kwargs):
+        self.calls.append(("POST", url, kwargs))
+        return FakeResponse(self.payload)
+
+
+@pytest.fixture
+def server():
+    """Create MCP server for testing."""
+    return MCPServer()
+
+
+def mock_truelayer_pages(monkeypatch, handler):
+    """Route the async page fetcher's requests to handler, recording the pages asked for."""
+    requested_pages = []
+
+    def recording_handler(request):
+        requested_pages.append(int(request.url.params["page"]))
+        return handler(request)
+
+    real_client = httpx.AsyncClient
+    monkeypatch.setattr(
+        "openbankingmcp.server.httpx.AsyncClient",
+        lambda **kwargs: real_client(**{**kwargs, "transport": httpx.MockTransport(recording_handler)})
+    )
+    return requested_pages
+
+
+def fetch_all_pages(server, limit=2):
+    return server._fetch_truelayer_transactions_all_pages("token123", "acc1", "2024-09-01", "2024-09-30", limit=limit)
+
+
+def test_server_uses_pooled_session(server):
+    """Test that the server owns a session with an HTTPS adapter mounted."""
+    assert isinstance(server.http, requests.Session)
+
+    adapter = server.http.get_adapter("https://api.truelayer-sandbox.com")
+    retry = adapter.max_retries
+    assert retry.total == 3
+    assert set(retry.status_forcelist) == {502, 503, 504}
+    assert {"GET", "POST"} <= set(retry.allowed_methods)
+    assert retry.respect_retry_after_header
+
+
+def test_fetch_accounts_goes_through_session(server):
+    """Test that account fetches reuse the shared session with a timeout."""
+    server.http = FakeSession({"results": [{"account_id": "acc1"}]})
+
+    accounts = server._fetch_truelayer_accounts("token123")
+
+    assert accounts == [{"account_id": "acc1"}]
+    method, url, kwargs = server.http.calls[0]
+    assert method == "GET"
+    assert url.endswith("/data/v1/accounts")
+    assert kwargs["timeout"] == TRUELAYER_TIMEOUT
+    assert kwargs["headers"]["Authorization"] == "Bearer token123"
+
+
+def test_fetch_accounts_is_cached_per_token(server, monkeypatch):
+    """Test that accounts are reused within the TTL for the same token only."""
+    server.http = FakeSession({"results": [{"account_id": "acc1"}]})
+
+    server._fetch_truelayer_accounts("token123")
+    server._fetch_truelayer_accounts("token123")
+    assert len(server.http.calls) == 1
+
+    server._fetch_truelayer_accounts("other-token")
+    assert len(server.http.calls) == 2
+
+    # Expire the cache entry
+    expiry, token, data = server._accounts_cache
+    server._accounts_cache = (expiry - 3600, token, data)
+    server._fetch_truelayer_accounts("other-token")
+    assert len(server.http.calls) == 3
+
+
+def test_fetch_transactions_is_cached_per_page(server):
+    """Test that transaction pages are cached by token, account, range and page."""
+    server.http = FakeSession({"results": [{"transaction_id": "t1"}]})
+
+    first = server._fetch_truelayer_transactions("token123", "acc1", "2024-09-01", "2024-09-30", 50, 1)
+    first.append({"transaction_id": "mutated"})
+    second = server._fetch_truelayer_transactions("token123", "acc1", "2024-09-01", "2024-09-30", 50, 1)
+    assert second == [{"transaction_id": "t1"}]
+    assert len(server.http.calls) == 1
+
+    server._fetch_truelayer_transactions("token123", "acc1", "2024-09-01", "2024-09-30", 50, 2)
+    assert len(server.http.calls) == 2
+
+
+def test_fetch_all_pages_stops_at_short_page(server, monkeypatch):
+    """Test that paginated fetches keep requesting pages until a short one."""
+    def handler(request):
+        page = int(request.url.params["page"])
+        # Pages 1-9 are full (2 results), page 10 is short, the rest are empty
+        if page < 10:
+            results = [{"id": f"p{page}a"}, {"id": f"p{page}b"}]
+        elif page == 10:
+            results = [{"id": "p10a"}]
+        else:
+            results = []
+        return httpx.Response(200, json={"results": results})
+
+    requested_pages = mock_truelayer_pages(monkeypatch, handler)
+
+    transactions = fetch_all_pages(server)
+
+    assert len(transactions) == 19
+    assert [t["id"] for t in transactions[:3]] == ["p1a", "p1b", "p2a"]
+    assert transactions[-1]["id"] == "p10a"
+    assert 1 in requested_pages and 10 in requested_pages
+
+
+def test_fetch_all_pages_stops_when_page_is_ignored(server, monkeypatch):
+    """Test that an API ignoring page/limit is fetched once, not looped over forever."""
+    everything = [{"transaction_id": f"t{i}"} for i in range(5)]
+    requested_pages = mock_truelayer_pages(
+        monkeypatch, lambda request: httpx.Response(200, json={"results": everything})
+    )
+
+    transactions = fetch_all_pages(server)
+
+    assert transactions == everything
+    assert max(requested_pages) <= 1 + server_module.TRUELAYER_MAX_CONCURRENT_PAGES
+
+
+def test_fetch_all_pages_treats_speculative_404_as_end(server, monkeypatch):
+    """Test that a 404 past the last page ends the fetch instead of failing it."""
+    def handler(request):
+        page = int(request.url.params["page"])
+        if page > 3:
+            return httpx.Response(404, json={"error": "not_found"})
+        return httpx.Response(200, json={"results": [{"transaction_id": f"p{page}a"}, {"transaction_id": f"p{page}b"}]})
+
+    mock_truelayer_pages(monkeypatch, handler)
+
+    assert len(fetch_all_pages(server)) == 6
+
+
+def test_fetch_all_pages_is_capped(server, monkeypatch):
+    """Test that an endless run of full, distinct pages stops at TRUELAYER_MAX_PAGES."""
+    monkeypatch.setattr(server_module, "TRUELAYER_MAX_PAGES", 5)
+
+    def handler(request):
+        page = int(request.url.params["page"])
+        return httpx.Response(200, json={"results": [{"transaction_id": f"p{page}a"}, {"transaction_id": f"p{page}b"}]})
+
+    requested_pages = mock_truelayer_pages(monkeypatch, handler)
+
+    assert len(fetch_all_pages(server)) == 10
+    assert max(requested_pages) == 5
+
+
+def test_fetch_all_pages_retries_gateway_errors_and_caches(server, monkeypatch):
+    """Test that pages are retried on 503 and then served from the page cache."""
+    attempts = []
+
+    def handler(request):
+        attempts.append(1)
+        if len(attempts) == 1:
+            return httpx.Response(503, headers={"Retry-After": "0"})
+        return httpx.Response(200, json={"results": [{"transaction_id": "t1"}]})
+
+    mock_truelayer_pages(monkeypatch, handler)
+
+    assert fetch_all_pages(server) == [{"transaction_id": "t1"}]
+    assert len(attempts) == 2
+
+    assert fetch_all_pages(server) == [{"transaction_id": "t1"}]
+    assert len(attempts) == 2
+
+
+def test_valid_token_is_returned_without_refresh(server):
+    """Test that an unexpired token is returned as-is."""
+    server.http = FakeSession({})
+    server._store_tokens({"access_token": "live", "refresh_token": "r1", "expires_in": 3600})
+
+    assert server._get_user_token() == "live"
+    assert server.http.calls == []
+
+
+def test_expired_token_is_refreshed_once(server, monkeypatch):
+    """Test that an expired token is refreshed via the refresh_token grant."""
+    monkeypatch.setenv("TRUELAYER_CLIENT_ID", "client")
+    monkeypatch.setenv("TRUELAYER_CLIENT_SECRET", "secret")
+    server.http = FakeSession({"access_token": "fresh", "expires_in": 3600})
+    server._store_tokens({"access_token": "stale", "refresh_token": "r1", "expires_in": 0})
+
+    assert server._get_user_token() == "fresh"
+    assert server._get_user_token() == "fresh"
+
+    assert len(server.http.calls) == 1
+    method, url, kwargs = server.http.calls[0]
+    assert method == "POST"
+    assert url.endswith("/connect/token")
+    assert kwargs["data"]["grant_type"] == "refresh_token"
+    assert kwargs["data"]["refresh_token"] == "r1"
+    # Refresh token is kept when the response does not rotate it
+    assert server.user_tokens["current"]["refresh_token"] == "r1"
@@ -0,0 +1,75 @@
+"""
+Tests for the MCP tool schema checks in openbankingmcp.validate.
+"""
+import pytest
+import openbankingmcp.validate as validate_module
+from openbankingmcp.validate import assert_tool_schema, validate_tools
+
+
+@pytest.fixture(params=["compiled", "python"], autouse=True)
+def validator(request, monkeypatch):
+    """Run each test with and without the compiled fastjsonschema fast path."""
+    if request.param == "compiled":
+        pytest.importorskip("fastjsonschema")
+    else:
+        monkeypatch.setattr(validate_module, "_TOOL_LIST_VALIDATOR", None)
+
+
+def make_tool(**overrides):
+    """Build a minimal valid tool definition."""
+    tool = {
+        "name": "list_accounts",
+        "description": "List accounts",
+        "inputSchema": {"type": "object", "properties": {}},
+        "outputSchema": {"type": "object", "properties": {"content": {"type": "array"}}}
+    }
+    tool.update(overrides)
+    return tool
+
+
+def test_valid_tools_pass_through():
+    """Test that valid tools are returned unchanged."""
+    tools = [make_tool(), make_tool(name="list_transactions")]
+    assert validate_tools(tools) is tools
+
+
+def test_valid_tools_skip_per_tool_checks(monkeypatch):
+    """Test that the compiled validator accepts a valid list without the per-tool checks."""
+    checked = []
+    monkeypatch.setattr(validate_module, "assert_tool_schema", checked.append)
+    validate_tools([make_tool()])
+
+    expected = [] if validate_module._TOOL_LIST_VALIDATOR is not None else [make_tool()]
+    assert checked == expected
+
+
+def test_missing_keys_are_all_reported():
+    """Test that every missing top-level key is named in the error."""
+    tool = make_tool()
+    del tool["description"]
+    del tool["inputSchema"]
+
+    with pytest.raises(ValueError, match="Tool missing required key: description, inputSchema"):
+        assert_tool_schema(tool)
+
+
+@pytest.mark.parametrize("output_schema,message", [
+    ([], "outputSchema must be an object"),
+    ({"type": "object"}, "outputSchema must have 'properties'"),
+    ({"properties": ["content"]}, "outputSchema.properties must be an object"),
+    ({"properties": "content"}, "outputSchema.properties must be an object"),
+    ({"properties": None}, "outputSchema.properties must be an object"),
+    ({"properties": {}}, "outputSchema.properties must include 'content'"),
+    ({"properties": {"content": None}}, "outputSchema.properties.content must be an object"),
+    ({"properties": {"content": {"type": "string"}}}, "outputSchema.properties.content must be an array"),
+])
+def test_output_schema_errors(output_schema, message):
+    """Test each outputSchema failure and that validate_tools names the tool."""
+    with pytest.raises(ValueError, match=f"Tool 0 \\(broken\\): {message}"):
+        validate_tools([make_tool(name="broken", outputSchema=output_schema)])
+
+
+def test_non_object_tool_is_rejected():
+    """Test that a tool that is not a dict raises ValueError rather than AttributeError."""
+    with pytest.raises(ValueError, match="Tool 1 \\(unnamed\\): Tool must be an object"):
+        validate_tools([make_tool(), "list_accounts"])
@@ -5,28 +5,39 @@ Run with: python serve.py
 Then open: http://localhost:8000
 """
 
+import functools
 import http.server
-import socketserver
 import webbrowser
-import os
 from pathlib import Path
 
 PORT = 8000
 
 class MyHTTPRequestHandler(http.server.SimpleHTTPRequestHandler):
+    # Set TCP_NODELAY on each connection so small responses aren't held back by Nagle
+    disable_nagle_algorithm = True
+
+    # CORS headers for local development, encoded once for every response
+    _CORS_HEADERS = (
+        b'Access-Control-Allow-Origin: *\r\n'
+        b'Access-Control-Allow-Methods: GET, POST, OPTIONS\r\n'
+        b'Access-Control-Allow-Headers: Content-Type\r\n'
+    )
+
     def end_headers(self):
-        # Add CORS headers for local development
-        self.send_header('Access-Control-Allow-Origin', '*')
-        self.send_header('Access-Control-Allow-Methods', 'GET, POST, OPTIONS')
-        self.send_header('Access-Control-Allow-Headers', 'Content-Type')
+        # Queue the pre-encoded block the way send_header would (HTTP/0.9 has no headers)
+        if self.request_version != 'HTTP/0.9':
+            if not hasattr(self, '_headers_buffer'):
+                self._headers_buffer = []
+            self._headers_buffer.append(self._CORS_HEADERS)
         super().end_headers()
 
 def main():
-    # Change to the web directory
+    # Serve the web directory without changing the process working directory
     web_dir = Path(__file__).parent
-    os.chdir(web_dir)
+    handler = functools.partial(MyHTTPRequestHandler, directory=str(web_dir))
 
-    with socketserver.TCPServer(("", PORT), MyHTTPRequestHandler) as httpd:
+    # Threaded so the browser's parallel asset requests aren't served one at a time
+    with http.server.ThreadingHTTPServer(("", PORT), handler) as httpd:
         print(f"🚀 Finance Autopilot server running at http://localhost:{PORT}")
         print("📁 Serving files from:", web_dir)
         print("🔄 Press Ctrl+C to stop")